@@ -0,0 +1,15 @@
+from django.contrib import admin
+from .models import ImportStat, WebhookStat
+
+@admin.register(WebhookStat)
+class WebhookStatAdmin(admin.ModelAdmin):
+    list_display = ['bucket_start', 'bucket', 'webhook', 'event_type', 'status', 'count']
+    list_filter = ['bucket', 'status', 'event_type']
+    ordering = ['-bucket_start']
+
+@admin.register(ImportStat)
+class ImportStatAdmin(admin.ModelAdmin):
+    list_display = ['bucket_start', 'bucket', 'processed_rows', 'success_count', 'error_count',
+                    'jobs_completed', 'jobs_failed']
+    list_filter = ['bucket']
+    ordering = ['-bucket_start']
\ No newline at end of file
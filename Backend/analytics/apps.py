@@ -0,0 +1,5 @@
+from django.apps import AppConfig
+
+class AnalyticsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'analytics'
\ No newline at end of file
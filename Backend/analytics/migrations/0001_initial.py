@@ -0,0 +1,52 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('webhook', '0003_webhookconfig_rate_limit'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.CharField(choices=[('minute', 'Minute'), ('hour', 'Hour')], max_length=10)),
+                ('bucket_start', models.DateTimeField()),
+                ('processed_rows', models.BigIntegerField(default=0)),
+                ('success_count', models.BigIntegerField(default=0)),
+                ('error_count', models.BigIntegerField(default=0)),
+                ('jobs_completed', models.IntegerField(default=0)),
+                ('jobs_failed', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'analytics_import_stat',
+                'ordering': ['bucket_start'],
+                'constraints': [models.UniqueConstraint(fields=('bucket', 'bucket_start'), name='analytics_import_stat_key')],
+            },
+        ),
+        migrations.CreateModel(
+            name='WebhookStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.CharField(choices=[('minute', 'Minute'), ('hour', 'Hour')], max_length=10)),
+                ('bucket_start', models.DateTimeField()),
+                ('event_type', models.CharField(max_length=50)),
+                ('status', models.CharField(choices=[('success', 'Success'), ('failed', 'Failed')], max_length=10)),
+                ('count', models.BigIntegerField(default=0)),
+                ('total_response_time', models.FloatField(default=0)),
+                ('webhook', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='webhook.webhookconfig')),
+            ],
+            options={
+                'db_table': 'analytics_webhook_stat',
+                'ordering': ['bucket_start'],
+                'constraints': [models.UniqueConstraint(fields=('bucket', 'bucket_start', 'webhook', 'event_type', 'status'), name='analytics_webhook_stat_key')],
+            },
+        ),
+    ]
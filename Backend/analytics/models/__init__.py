@@ -0,0 +1,4 @@
+from .import_stat import ImportStat
+from .webhook_stat import WebhookStat
+
+__all__ = ['ImportStat', 'WebhookStat']
\ No newline at end of file
@@ -0,0 +1,22 @@
+from django.db import models
+from .webhook_stat import BUCKET_CHOICES
+
+class ImportStat(models.Model):
+    """Imported rows and finished import jobs per time bucket"""
+    bucket = models.CharField(max_length=10, choices=BUCKET_CHOICES)
+    bucket_start = models.DateTimeField()
+    processed_rows = models.BigIntegerField(default=0)
+    success_count = models.BigIntegerField(default=0)
+    error_count = models.BigIntegerField(default=0)
+    jobs_completed = models.IntegerField(default=0)
+    jobs_failed = models.IntegerField(default=0)
+    
+    class Meta:
+        db_table = 'analytics_import_stat'
+        ordering = ['bucket_start']
+        constraints = [
+            models.UniqueConstraint(fields=['bucket', 'bucket_start'], name='analytics_import_stat_key'),
+        ]
+    
+    def __str__(self):
+        return f"{self.bucket} {self.bucket_start}: {self.processed_rows} rows"
\ No newline at end of file
@@ -0,0 +1,35 @@
+from django.db import models
+from webhook.models import WebhookConfig
+
+BUCKET_CHOICES = [
+    ('minute', 'Minute'),
+    ('hour', 'Hour'),
+]
+
+class WebhookStat(models.Model):
+    """Webhook deliveries per time bucket, webhook, event type and outcome"""
+    STATUS_CHOICES = [
+        ('success', 'Success'),
+        ('failed', 'Failed'),
+    ]
+    
+    bucket = models.CharField(max_length=10, choices=BUCKET_CHOICES)
+    bucket_start = models.DateTimeField()
+    webhook = models.ForeignKey(WebhookConfig, on_delete=models.CASCADE, related_name='stats')
+    event_type = models.CharField(max_length=50)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES)
+    count = models.BigIntegerField(default=0)
+    total_response_time = models.FloatField(default=0)  # in seconds
+    
+    class Meta:
+        db_table = 'analytics_webhook_stat'
+        ordering = ['bucket_start']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['bucket', 'bucket_start', 'webhook', 'event_type', 'status'],
+                name='analytics_webhook_stat_key',
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.bucket} {self.bucket_start} {self.event_type} {self.status}: {self.count}"
\ No newline at end of file
@@ -0,0 +1,193 @@
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.db import connection
+from django.db.models import Sum
+from django.db.models.functions import TruncDay
+from django.utils import timezone
+from analytics.models import ImportStat, WebhookStat
+
+BUCKET_SECONDS = {'minute': 60, 'hour': 3600}
+INTERVALS = {
+    'minute': timedelta(minutes=1),
+    'hour': timedelta(hours=1),
+    'day': timedelta(days=1),
+}
+DEFAULT_RANGES = {
+    'minute': timedelta(hours=1),
+    'hour': timedelta(days=1),
+    'day': timedelta(days=30),
+}
+IMPORT_COUNTERS = ['processed_rows', 'success_count', 'error_count', 'jobs_completed', 'jobs_failed']
+
+class AnalyticsQueryError(ValueError):
+    """Raised when a time-series query is out of bounds"""
+
+def bucket_start(moment, bucket):
+    """Start of the UTC bucket containing moment"""
+    seconds = BUCKET_SECONDS[bucket]
+    timestamp = int(moment.timestamp())
+    return datetime.fromtimestamp(timestamp - timestamp % seconds, tz=dt_timezone.utc)
+
+def _increment(model, key_fields, counter_fields, rows):
+    """
+    Add counters to rollup rows, creating missing ones.
+
+    A single INSERT ... ON CONFLICT DO UPDATE per row, supported by
+    PostgreSQL and SQLite, so concurrent workers never lose an increment.
+    Rows are written in key order so that concurrent transactions lock them
+    in the same order and cannot deadlock.
+    """
+    if not rows:
+        return
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    columns = [model._meta.get_field(name).column for name in key_fields + counter_fields]
+    key_columns = columns[:len(key_fields)]
+    sql = 'INSERT INTO {table} ({columns}) VALUES ({values}) ON CONFLICT ({keys}) DO UPDATE SET {updates}'.format(
+        table=table,
+        columns=', '.join(quote(column) for column in columns),
+        values=', '.join(['%s'] * len(columns)),
+        keys=', '.join(quote(column) for column in key_columns),
+        updates=', '.join(
+            f'{quote(column)} = {table}.{quote(column)} + excluded.{quote(column)}'
+            for column in columns[len(key_fields):]
+        ),
+    )
+    adapt = connection.ops.adapt_datetimefield_value
+    params = [
+        [adapt(value) if isinstance(value, datetime) else value for value in row]
+        for row in sorted(rows, key=lambda row: row[:len(key_fields)])
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, params)
+
+def record_webhook_logs(logs):
+    """Fold written WebhookLog rows into the minute and hour buckets of their delivery"""
+    totals = defaultdict(lambda: [0, 0.0])
+    for log in logs:
+        status = 'success' if log.success else 'failed'
+        for bucket in BUCKET_SECONDS:
+            key = (bucket, bucket_start(log.delivered_at, bucket), log.webhook_id, log.event_type, status)
+            totals[key][0] += 1
+            totals[key][1] += log.response_time or 0
+    _increment(
+        WebhookStat,
+        ['bucket', 'bucket_start', 'webhook', 'event_type', 'status'],
+        ['count', 'total_response_time'],
+        [(*key, count, response_time) for key, (count, response_time) in totals.items()],
+    )
+
+def record_import(processed_rows=0, success_count=0, error_count=0, jobs_completed=0, jobs_failed=0):
+    """Add import progress to the current minute and hour buckets"""
+    now = timezone.now()
+    counters = [processed_rows, success_count, error_count, jobs_completed, jobs_failed]
+    _increment(
+        ImportStat,
+        ['bucket', 'bucket_start'],
+        IMPORT_COUNTERS,
+        [(bucket, bucket_start(now, bucket), *counters) for bucket in BUCKET_SECONDS],
+    )
+
+def compact_rollups(now=None):
+    """
+    Drop buckets past their retention.
+
+    Hour buckets are written alongside minute buckets, so pruning minute
+    rows loses only resolution. Returns the number of rows deleted.
+    """
+    now = now or timezone.now()
+    minute_cutoff = now - timedelta(hours=settings.ANALYTICS_MINUTE_RETENTION_HOURS)
+    hour_cutoff = now - timedelta(days=settings.ANALYTICS_HOUR_RETENTION_DAYS)
+    deleted = 0
+    for model in (WebhookStat, ImportStat):
+        deleted += model.objects.filter(bucket='minute', bucket_start__lt=minute_cutoff).delete()[0]
+        deleted += model.objects.filter(bucket='hour', bucket_start__lt=hour_cutoff).delete()[0]
+    return deleted
+
+def _time_range(interval, since=None, until=None):
+    if interval not in INTERVALS:
+        raise AnalyticsQueryError(f'interval must be one of: {", ".join(INTERVALS)}')
+    step = INTERVALS[interval]
+    until = until or timezone.now()
+    since = since or until - DEFAULT_RANGES[interval]
+    if since >= until:
+        raise AnalyticsQueryError('since must be before until')
+    if (until - since) / step > settings.ANALYTICS_MAX_POINTS:
+        raise AnalyticsQueryError(f'At most {settings.ANALYTICS_MAX_POINTS} points per query; use a larger interval')
+
+    # Day points are summed from hour buckets
+    bucket = 'hour' if interval == 'day' else interval
+    start = bucket_start(since, bucket)
+    if interval == 'day':
+        start = start.replace(hour=0)
+    return bucket, start, until, step
+
+def _series_rows(queryset, interval, bucket, start, until):
+    """Filter rollup rows to the range, returning them with the field that holds each point's time"""
+    queryset = queryset.filter(bucket=bucket, bucket_start__gte=start, bucket_start__lt=until)
+    if interval == 'day':
+        return queryset.annotate(day=TruncDay('bucket_start', tzinfo=dt_timezone.utc)), 'day'
+    return queryset, 'bucket_start'
+
+def _points(start, until, step):
+    points = []
+    time = start
+    while time < until:
+        points.append(time)
+        time += step
+    return points
+
+def webhook_series(interval='hour', since=None, until=None, webhook_id=None, event_type=None):
+    """
+    Delivery counts, success rate and mean response time per interval.
+
+    Reads only rollup rows, so the cost depends on the time range and not
+    on the number of deliveries. Empty intervals are returned as zeros.
+    """
+    bucket, start, until, step = _time_range(interval, since, until)
+    queryset = WebhookStat.objects.all()
+    if webhook_id is not None:
+        queryset = queryset.filter(webhook_id=webhook_id)
+    if event_type:
+        queryset = queryset.filter(event_type=event_type)
+    queryset, time_field = _series_rows(queryset, interval, bucket, start, until)
+
+    totals = defaultdict(lambda: {'success': 0, 'failed': 0, 'response_time': 0.0})
+    rows = queryset.values(time_field, 'status').annotate(
+        count=Sum('count'), response_time=Sum('total_response_time')
+    ).order_by()
+    for row in rows:
+        entry = totals[row[time_field]]
+        entry[row['status']] += row['count']
+        entry['response_time'] += row['response_time']
+
+    series = []
+    for time in _points(start, until, step):
+        entry = totals.get(time, {'success': 0, 'failed': 0, 'response_time': 0.0})
+        total = entry['success'] + entry['failed']
+        series.append({
+            'time': time,
+            'total': total,
+            'success': entry['success'],
+            'failed': entry['failed'],
+            'success_rate': round(entry['success'] / total, 4) if total else None,
+            'avg_response_time': round(entry['response_time'] / total, 4) if total else None,
+        })
+    return series
+
+def import_series(interval='hour', since=None, until=None):
+    """Imported rows and finished jobs per interval, read from rollup rows only"""
+    bucket, start, until, step = _time_range(interval, since, until)
+    queryset, time_field = _series_rows(ImportStat.objects.all(), interval, bucket, start, until)
+
+    rows = queryset.values(time_field).annotate(
+        **{counter: Sum(counter) for counter in IMPORT_COUNTERS}
+    ).order_by()
+    totals = {row[time_field]: row for row in rows}
+
+    series = []
+    for time in _points(start, until, step):
+        row = totals.get(time, {})
+        series.append({'time': time, **{counter: row.get(counter) or 0 for counter in IMPORT_COUNTERS}})
+    return series
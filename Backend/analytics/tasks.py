@@ -0,0 +1,7 @@
+from celery import shared_task
+from .services.rollups import compact_rollups
+
+@shared_task
+def compact_analytics():
+    """Prune rollup buckets past their retention"""
+    return compact_rollups()
\ No newline at end of file
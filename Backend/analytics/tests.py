@@ -0,0 +1,37 @@
+import threading
+from datetime import datetime, timezone as dt_timezone
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.test import TransactionTestCase
+from analytics.models import ImportStat
+from analytics.services.rollups import record_import
+
+class RollupTests(TransactionTestCase):
+    def _totals(self, bucket):
+        return ImportStat.objects.filter(bucket=bucket).aggregate(
+            rows=Sum('processed_rows'), jobs=Sum('jobs_completed')
+        )
+
+    def test_concurrent_increments_add_up(self):
+        threads, calls = 8, 25
+        errors = []
+
+        def worker():
+            try:
+                for _ in range(calls):
+                    with transaction.atomic():
+                        record_import(processed_rows=2, jobs_completed=1)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        for bucket in ('minute', 'hour'):
+            self.assertEqual(self._totals(bucket), {'rows': threads * calls * 2, 'jobs': threads * calls})
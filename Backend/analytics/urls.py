@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import import_analytics, webhook_analytics
+
+urlpatterns = [
+    path('analytics/webhooks', webhook_analytics, name='webhook_analytics'),
+    path('analytics/imports', import_analytics, name='import_analytics'),
+]
\ No newline at end of file
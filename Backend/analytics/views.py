@@ -0,0 +1,63 @@
+from datetime import timezone as dt_timezone
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from core.db_routing import replica_reads
+from .services.rollups import AnalyticsQueryError, import_series, webhook_series
+
+def _parse_time(request, name):
+    value = request.query_params.get(name)
+    if not value:
+        return None
+    moment = parse_datetime(value)
+    if moment is None:
+        raise AnalyticsQueryError(f'{name} must be an ISO 8601 datetime')
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment, dt_timezone.utc)
+    return moment
+
+@api_view(['GET'])
+@replica_reads
+def webhook_analytics(request):
+    """
+    GET /api/analytics/webhooks
+    Webhook deliveries per minute, hour or day
+    """
+    webhook_id = request.query_params.get('webhook')
+    if webhook_id is not None and not webhook_id.isdigit():
+        return Response({'error': 'webhook must be an integer id'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        interval = request.query_params.get('interval', 'hour')
+        series = webhook_series(
+            interval,
+            since=_parse_time(request, 'since'),
+            until=_parse_time(request, 'until'),
+            webhook_id=webhook_id,
+            event_type=request.query_params.get('event_type'),
+        )
+    except AnalyticsQueryError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response({'interval': interval, 'data': series})
+
+@api_view(['GET'])
+@replica_reads
+def import_analytics(request):
+    """
+    GET /api/analytics/imports
+    Imported rows and finished import jobs per minute, hour or day
+    """
+    try:
+        interval = request.query_params.get('interval', 'hour')
+        series = import_series(
+            interval,
+            since=_parse_time(request, 'since'),
+            until=_parse_time(request, 'until'),
+        )
+    except AnalyticsQueryError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response({'interval': interval, 'data': series})
\ No newline at end of file
@@ -0,0 +1,19 @@
+import os
+from django.core.asgi import get_asgi_application
+from core.async_http import close_async_client
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django_application = get_asgi_application()
+
+async def application(scope, receive, send):
+    """Django for HTTP; lifespan shutdown closes the worker's shared async client"""
+    if scope['type'] != 'lifespan':
+        return await django_application(scope, receive, send)
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await close_async_client()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
@@ -5,4 +5,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 app = Celery('product_importer')
 app.config_from_object('django.conf:settings', namespace='CELERY')
-app.autodiscover_tasks()
\ No newline at end of file
+app.autodiscover_tasks()
+
+# Connection lifecycle hooks for worker processes
+import core.worker_hooks  # noqa: E402,F401
\ No newline at end of file
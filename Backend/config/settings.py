@@ -1,4 +1,5 @@
 import os
+import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -8,6 +9,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = os.getenv('SECRET_KEY', 'django-insecure-change-me')
 DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
+TESTING = len(sys.argv) > 1 and sys.argv[1] == 'test'
 ALLOWED_HOSTS = os.getenv('ALLOWED_HOSTS', 'localhost,127.0.0.1').split(',')
 
 INSTALLED_APPS = [
@@ -29,6 +31,7 @@ INSTALLED_APPS = [
     'product',
     'import_manager',
     'webhook',
+    'analytics',
 ]
 
 MIDDLEWARE = [
@@ -41,6 +44,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.db_routing.PrimaryPinningMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -62,25 +66,73 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
 
 import dj_database_url
 
 DATABASE_URL = os.getenv('DATABASE_URL')
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', '600'))
+# Behind PgBouncer in transaction pooling mode server-side cursors cannot
+# outlive a transaction, so iterator() must fetch client-side
+DB_PGBOUNCER = os.getenv('DB_PGBOUNCER', 'False').lower() == 'true'
 if DATABASE_URL:
     DATABASES = {
         'default': dj_database_url.parse(DATABASE_URL,
-        conn_max_age=600,
+        conn_max_age=DB_CONN_MAX_AGE,
+        conn_health_checks=True,
+        disable_server_side_cursors=DB_PGBOUNCER,
       ssl_require=True)
         
     }
 else:
+    # Single-node profile: WAL lets readers run alongside the writer, and
+    # IMMEDIATE transactions take the write lock up front so concurrent
+    # writers wait on the busy timeout instead of failing with
+    # "database is locked" when a read transaction upgrades.
     DATABASES = {
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
-            "NAME": BASE_DIR / "db.sqlite3",
+            "NAME": os.getenv('SQLITE_PATH', BASE_DIR / "db.sqlite3"),
+            "OPTIONS": {
+                "init_command": (
+                    "PRAGMA journal_mode=WAL;"
+                    "PRAGMA synchronous=NORMAL;"
+                    f"PRAGMA mmap_size={int(os.getenv('SQLITE_MMAP_SIZE', 268435456))};"
+                    "PRAGMA cache_size=-65536;"
+                ),
+                "timeout": int(os.getenv('SQLITE_BUSY_TIMEOUT', '30')),
+                "transaction_mode": "IMMEDIATE",
+            },
+            # A file rather than the default in-memory database, whose shared
+            # cache fails concurrent writers instead of queueing them
+            "TEST": {"NAME": BASE_DIR / "test_db.sqlite3"},
         }
     }
 
+# Read replicas: comma-separated database URLs, registered as replica_0, replica_1, ...
+DATABASE_REPLICA_URLS = [url for url in os.getenv('DATABASE_REPLICA_URLS', '').split(',') if url]
+for index, replica_url in enumerate(DATABASE_REPLICA_URLS):
+    DATABASES[f'replica_{index}'] = dj_database_url.parse(
+        replica_url,
+        conn_max_age=DB_CONN_MAX_AGE,
+        conn_health_checks=True,
+        disable_server_side_cursors=DB_PGBOUNCER,
+        ssl_require=replica_url.startswith('postgres'),
+        test_options={'MIRROR': 'default'},
+    )
+if TESTING and not DATABASE_REPLICA_URLS:
+    # A separate, migrated but unreplicated database stands in for a replica
+    # so tests can tell which database a read was served from
+    DATABASES['replica_0'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'replica.sqlite3',
+        'REPLICA_STANDIN': True,
+    }
+DATABASE_ROUTERS = ['core.db_routing.ReplicaRouter']
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', '5'))
+REPLICA_MAX_LAG_SECONDS = float(os.getenv('REPLICA_MAX_LAG_SECONDS', '10'))
+REPLICA_LAG_CHECK_INTERVAL = float(os.getenv('REPLICA_LAG_CHECK_INTERVAL', '5'))
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -104,7 +156,11 @@ CORS_ALLOWED_ORIGINS = os.getenv('CORS_ALLOWED_ORIGINS', 'http://localhost:3000'
 CORS_ALLOW_CREDENTIALS = True
 
 # Celery Configuration
-redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+# TLS Redis is used without certificate verification. Celery takes that as a
+# URL parameter; redis-py clients take it as an option instead.
+REDIS_OPTIONS = {'ssl_cert_reqs': 'none'} if REDIS_URL.startswith('rediss://') else {}
+redis_url = REDIS_URL
 if redis_url.startswith('rediss://'):
     redis_url += '?ssl_cert_reqs=CERT_NONE'
 CELERY_BROKER_URL = redis_url
@@ -113,6 +169,123 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
+CELERY_TASK_ROUTES = {
+    'import_manager.tasks.*': {'queue': 'imports'},
+    'webhook.tasks.*': {'queue': 'webhooks'},
+    'product.tasks.verify_images_async': {'queue': 'images'},
+}
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    'priority_steps': list(range(10)),
+    'queue_order_strategy': 'priority',
+    # Unacked and ETA tasks are redelivered after this; keep it well above
+    # WEBHOOK_MAX_DEFER_SECONDS and the longest late-acked task
+    'visibility_timeout': int(os.getenv('CELERY_VISIBILITY_TIMEOUT', '3600')),
+}
+# Hand out one task at a time so sliced imports interleave fairly
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+# Keep worker DB connections across tasks (Celery otherwise closes them
+# around every task); they are still recycled after this many tasks
+CELERY_DB_REUSE_MAX = int(os.getenv('CELERY_DB_REUSE_MAX', '1000'))
+CELERY_BEAT_SCHEDULE = {
+    'relay-product-events': {
+        'task': 'webhook.tasks.relay_product_events',
+        'schedule': float(os.getenv('OUTBOX_RELAY_INTERVAL', '2')),
+    },
+    'sequence-product-changes': {
+        'task': 'product.tasks.sequence_product_changes',
+        'schedule': float(os.getenv('CHANGE_FEED_SEQUENCE_INTERVAL', '1')),
+    },
+    'sweep-coalesced-webhooks': {
+        'task': 'webhook.tasks.sweep_coalesced_webhooks',
+        'schedule': 60.0,
+    },
+    'archive-inactive-products': {
+        'task': 'product.tasks.archive_products_async',
+        'schedule': 86400.0,
+    },
+    'compact-analytics': {
+        'task': 'analytics.tasks.compact_analytics',
+        'schedule': 3600.0,
+    },
+}
+
+# Import scheduling
+IMPORT_MAX_CONCURRENT_JOBS = int(os.getenv('IMPORT_MAX_CONCURRENT_JOBS', '4'))
+IMPORT_MAX_CONCURRENT_JOBS_PER_USER = int(os.getenv('IMPORT_MAX_CONCURRENT_JOBS_PER_USER', '2'))
+IMPORT_BATCHES_PER_SLICE = int(os.getenv('IMPORT_BATCHES_PER_SLICE', '10'))
+IMPORT_ADMISSION_RETRY_SECONDS = int(os.getenv('IMPORT_ADMISSION_RETRY_SECONDS', '5'))
+# A processing job without a batch for this long is presumed dead and stops
+# counting against the caps; keep it above a slice's run and queue time
+IMPORT_STALE_AFTER_SECONDS = int(os.getenv('IMPORT_STALE_AFTER_SECONDS', '600'))
+# Dry runs: rows per SKU lookup, and sample changes kept per kind
+IMPORT_PREVIEW_CHUNK_SIZE = int(os.getenv('IMPORT_PREVIEW_CHUNK_SIZE', '5000'))
+IMPORT_PREVIEW_SAMPLE_SIZE = int(os.getenv('IMPORT_PREVIEW_SAMPLE_SIZE', '20'))
+
+# Webhook logs are buffered and written every batch or every few seconds
+WEBHOOK_LOG_BATCH_SIZE = int(os.getenv('WEBHOOK_LOG_BATCH_SIZE', '200'))
+WEBHOOK_LOG_FLUSH_SECONDS = float(os.getenv('WEBHOOK_LOG_FLUSH_SECONDS', '5'))
+
+# Outbox events per delivery task
+OUTBOX_DELIVERY_BATCH_SIZE = int(os.getenv('OUTBOX_DELIVERY_BATCH_SIZE', '50'))
+
+# Seconds a coalesced flush may run before the sweeper assumes its worker
+# died and puts the events back (they may then be delivered twice)
+WEBHOOK_COALESCE_INFLIGHT_TIMEOUT = int(os.getenv('WEBHOOK_COALESCE_INFLIGHT_TIMEOUT', '900'))
+
+# Webhook rate limiting: retries after 429 responses, and the pause used when
+# Retry-After is missing or unparseable (seconds, capped at the maximum)
+WEBHOOK_RATE_LIMIT_MAX_RETRIES = int(os.getenv('WEBHOOK_RATE_LIMIT_MAX_RETRIES', '5'))
+WEBHOOK_RETRY_AFTER_DEFAULT = int(os.getenv('WEBHOOK_RETRY_AFTER_DEFAULT', '30'))
+WEBHOOK_RETRY_AFTER_MAX = int(os.getenv('WEBHOOK_RETRY_AFTER_MAX', '3600'))
+# Longest single countdown; longer waits are re-deferred in steps
+WEBHOOK_MAX_DEFER_SECONDS = int(os.getenv('WEBHOOK_MAX_DEFER_SECONDS', '300'))
+
+# Analytics rollups: minute buckets are pruned after a couple of days, hour
+# buckets kept for a year and more
+ANALYTICS_MINUTE_RETENTION_HOURS = int(os.getenv('ANALYTICS_MINUTE_RETENTION_HOURS', '48'))
+ANALYTICS_HOUR_RETENTION_DAYS = int(os.getenv('ANALYTICS_HOUR_RETENTION_DAYS', '400'))
+ANALYTICS_MAX_POINTS = int(os.getenv('ANALYTICS_MAX_POINTS', '1500'))
+
+# Cold archive for products inactive longer than PRODUCT_ARCHIVE_AFTER_DAYS
+PRODUCT_ARCHIVE_AFTER_DAYS = int(os.getenv('PRODUCT_ARCHIVE_AFTER_DAYS', '90'))
+PRODUCT_ARCHIVE_BATCH_SIZE = int(os.getenv('PRODUCT_ARCHIVE_BATCH_SIZE', '1000'))
+
+# Outgoing HTTP: process-wide keep-alive pool used for webhook deliveries
+HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', '50'))  # hosts kept
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '20'))  # connections per host
+HTTP_STATS_INTERVAL = int(os.getenv('HTTP_STATS_INTERVAL', '30'))
+
+# Image URL verification
+IMAGE_VERIFY_CONCURRENCY = int(os.getenv('IMAGE_VERIFY_CONCURRENCY', '200'))
+IMAGE_VERIFY_PER_HOST = int(os.getenv('IMAGE_VERIFY_PER_HOST', '32'))
+IMAGE_VERIFY_TIMEOUT = float(os.getenv('IMAGE_VERIFY_TIMEOUT', '10'))
+
+# Cache Configuration
+# Product responses are cached per catalog generation. The cache must be
+# shared by the web processes and the Celery workers that bump it, so it
+# defaults to the broker's Redis; CACHE_URL=locmem:// keeps a per-process cache.
+CACHE_URL = os.getenv('CACHE_URL', REDIS_URL)
+if TESTING or CACHE_URL.startswith('locmem://'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'product-importer',
+            'OPTIONS': {'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', '1000'))},
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+            'OPTIONS': {'ssl_cert_reqs': 'none'} if CACHE_URL.startswith('rediss://') else {},
+        }
+    }
+PRODUCT_CACHE_TIMEOUT = int(os.getenv('PRODUCT_CACHE_TIMEOUT', '300'))
+
+# Bulk product upsert/update API
+BULK_UPSERT_MAX_ITEMS = int(os.getenv('BULK_UPSERT_MAX_ITEMS', '50000'))
+BULK_UPSERT_BATCH_SIZE = int(os.getenv('BULK_UPSERT_BATCH_SIZE', '1000'))
 
 # REST Framework
 REST_FRAMEWORK = {
@@ -13,6 +13,7 @@ urlpatterns = [
     path('api/', include('product.urls')),
     path('api/', include('import_manager.urls')),
     path('api/', include('webhook.urls')),
+    path('api/', include('analytics.urls')),
     path('api/dashboard/stats', dashboard_stats, name='dashboard_stats'),
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
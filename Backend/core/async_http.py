@@ -0,0 +1,27 @@
+import asyncio
+import weakref
+import httpx
+
+_clients = weakref.WeakKeyDictionary()
+
+def get_async_client():
+    """
+    Return the httpx.AsyncClient shared by the running event loop.
+
+    Under ASGI there is one loop per worker, so every async view reuses the
+    same connection pool. Clients are bound to their loop, hence one per loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+        _clients[loop] = client
+    return client
+
+async def close_async_client():
+    """Close the running loop's client and its pooled connections"""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,164 @@
+import functools
+import logging
+import random
+import time
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+PIN_COOKIE = 'db_primary_until'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+_replica_reads = ContextVar('replica_reads', default=False)
+_pinned_to_primary = ContextVar('pinned_to_primary', default=False)
+
+# alias -> (checked_at, lag_seconds)
+_lag_cache = {}
+
+LAG_QUERIES = {
+    # Zero when caught up, or when the database is not a streaming replica
+    'postgresql': """
+        SELECT CASE
+            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+        END
+    """,
+}
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias.startswith('replica_')]
+
+def replica_reads(view_func):
+    """Allow reads made while the view runs to be served by a replica"""
+    if iscoroutinefunction(view_func):
+        @functools.wraps(view_func)
+        async def async_wrapper(*args, **kwargs):
+            token = _replica_reads.set(True)
+            try:
+                return await view_func(*args, **kwargs)
+            finally:
+                _replica_reads.reset(token)
+        return async_wrapper
+
+    @functools.wraps(view_func)
+    def wrapper(*args, **kwargs):
+        token = _replica_reads.set(True)
+        try:
+            return view_func(*args, **kwargs)
+        finally:
+            _replica_reads.reset(token)
+    return wrapper
+
+def _replica_lag(alias):
+    checked_at, lag = _lag_cache.get(alias, (0, None))
+    if time.monotonic() - checked_at < settings.REPLICA_LAG_CHECK_INTERVAL:
+        return lag
+
+    query = LAG_QUERIES.get(connections[alias].vendor)
+    try:
+        if query is None:
+            lag = 0
+        else:
+            with connections[alias].cursor() as cursor:
+                cursor.execute(query)
+                lag = float(cursor.fetchone()[0])
+    except Exception as e:
+        logger.warning('Replica %s lag check failed: %s', alias, e)
+        lag = float('inf')
+    _lag_cache[alias] = (time.monotonic(), lag)
+    return lag
+
+def is_pinned_to_primary():
+    """Whether the current request comes from a client that wrote recently"""
+    return _pinned_to_primary.get()
+
+def replicas_caught_up():
+    """
+    Whether reads made here see every committed write.
+
+    True when they go to the primary, or when each replica they may be
+    routed to reported no lag at its last check.
+    """
+    if not _replica_reads.get() or _pinned_to_primary.get():
+        return True
+    for alias in replica_aliases():
+        lag = _replica_lag(alias)
+        if 0 < lag <= settings.REPLICA_MAX_LAG_SECONDS:
+            return False
+    return True
+
+class ReplicaRouter:
+    """
+    Send reads from views marked with replica_reads to a healthy replica.
+
+    Everything else, writes, and reads from clients pinned after a recent
+    write go to the primary. Replicas lagging more than
+    REPLICA_MAX_LAG_SECONDS are skipped until they catch up.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not _replica_reads.get() or _pinned_to_primary.get():
+            return 'default'
+        healthy = [
+            alias for alias in replica_aliases()
+            if _replica_lag(alias) <= settings.REPLICA_MAX_LAG_SECONDS
+        ]
+        return random.choice(healthy) if healthy else 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Real replicas get the schema by replication; test stand-ins need it
+        return not db.startswith('replica_') or settings.DATABASES[db].get('REPLICA_STANDIN', False)
+
+class PrimaryPinningMiddleware:
+    """
+    Pin a client to the primary for REPLICA_PIN_SECONDS after it writes,
+    so it reads its own writes while the replicas catch up.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _pinned_to_primary.set(self._is_pinned(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            _pinned_to_primary.reset(token)
+        return self._pin_after_write(request, response)
+
+    async def __acall__(self, request):
+        token = _pinned_to_primary.set(self._is_pinned(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            _pinned_to_primary.reset(token)
+        return self._pin_after_write(request, response)
+
+    def _is_pinned(self, request):
+        try:
+            return float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
+
+    def _pin_after_write(self, request, response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            pin_seconds = settings.REPLICA_PIN_SECONDS
+            response.set_cookie(
+                PIN_COOKIE, str(time.time() + pin_seconds), max_age=pin_seconds, httponly=True, samesite='Lax'
+            )
+        return response
@@ -0,0 +1,77 @@
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+
+_session = None
+_session_pid = None
+_adapter = None
+_lock = threading.Lock()
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that keeps the counters of connection pools it discards"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.retired = {'requests': 0, 'connections': 0}
+        dispose = self.poolmanager.pools.dispose_func
+
+        def retire(pool):
+            self.retired['requests'] += pool.num_requests
+            self.retired['connections'] += pool.num_connections
+            dispose(pool)
+
+        self.poolmanager.pools.dispose_func = retire
+
+    def stats(self):
+        pools = self.poolmanager.pools
+        live = []
+        for key in pools.keys():
+            try:
+                live.append(pools[key])
+            except KeyError:
+                # Evicted meanwhile; already counted as retired
+                pass
+        requests_sent = self.retired['requests'] + sum(pool.num_requests for pool in live)
+        connections = self.retired['connections'] + sum(pool.num_connections for pool in live)
+        return {
+            'requests': requests_sent,
+            'connections': connections,
+            'reused': max(requests_sent - connections, 0),
+            'reuse_ratio': round(1 - connections / requests_sent, 4) if requests_sent else None,
+            'hosts': len(live),
+        }
+
+def get_session():
+    """
+    Return the process-wide requests.Session with pooled keep-alive connections.
+
+    A forked child gets its own session instead of sharing the parent's sockets.
+    """
+    global _session, _session_pid, _adapter
+    if _session is None or _session_pid != os.getpid():
+        with _lock:
+            if _session is None or _session_pid != os.getpid():
+                adapter = PooledHTTPAdapter(
+                    pool_connections=settings.HTTP_POOL_CONNECTIONS,
+                    pool_maxsize=settings.HTTP_POOL_MAXSIZE,
+                )
+                session = requests.Session()
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session, _session_pid, _adapter = session, os.getpid(), adapter
+    return _session
+
+def session_stats():
+    """Connection reuse counters of this process's session"""
+    if _adapter is None or _session_pid != os.getpid():
+        return {'requests': 0, 'connections': 0, 'reused': 0, 'reuse_ratio': None, 'hosts': 0}
+    return _adapter.stats()
+
+def close_session():
+    global _session, _adapter
+    with _lock:
+        if _session is not None and _session_pid == os.getpid():
+            _session.close()
+        _session = _adapter = None
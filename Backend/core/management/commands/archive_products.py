@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from product.services.archive import archive_inactive_products
+
+class Command(BaseCommand):
+    help = 'Move long-inactive products to the product_product_archive table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.PRODUCT_ARCHIVE_AFTER_DAYS,
+            help='Archive products inactive for longer than this many days'
+        )
+        parser.add_argument('--batch-size', type=int, default=settings.PRODUCT_ARCHIVE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        archived = archive_inactive_products(options['days'], options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Archived {archived} products'))
@@ -0,0 +1,41 @@
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from product.models import ProductProduct
+from product.services.catalog_export import (
+    DEFAULT_CHUNK_SIZE, EXPORT_FORMATS, ExportError, stream_export
+)
+
+class Command(BaseCommand):
+    help = 'Export the product catalog as CSV, NDJSON or Parquet'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', dest='export_format', choices=list(EXPORT_FORMATS), default='csv')
+        parser.add_argument('--gzip', action='store_true', help='Compress the output with gzip')
+        parser.add_argument('--output', '-o', help='Output file (defaults to stdout)')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument('--active-only', action='store_true', help='Only export active products')
+
+    def handle(self, *args, **options):
+        queryset = ProductProduct.objects.all()
+        if options['active_only']:
+            queryset = queryset.filter(is_active=True)
+
+        try:
+            stream = stream_export(
+                queryset, options['export_format'], options['gzip'], options['chunk_size']
+            )
+        except ExportError as e:
+            raise CommandError(str(e))
+
+        output = open(options['output'], 'wb') if options['output'] else sys.stdout.buffer
+        try:
+            for data in stream:
+                output.write(data)
+        finally:
+            if options['output']:
+                output.close()
+            else:
+                output.flush()
+
+        if options['output']:
+            self.stdout.write(self.style.SUCCESS(f'Exported products to {options["output"]}'))
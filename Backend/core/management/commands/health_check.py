@@ -2,6 +2,7 @@ from django.core.management.base import BaseCommand
 from django.db import connection
 from django.conf import settings
 import redis
+from core.worker_hooks import published_http_stats
 
 class Command(BaseCommand):
     help = 'Check system health (database, redis, etc.)'
@@ -12,6 +13,11 @@ class Command(BaseCommand):
             with connection.cursor() as cursor:
                 cursor.execute("SELECT 1")
             self.stdout.write(self.style.SUCCESS('✓ Database connection: OK'))
+            self.stdout.write(
+                f"  CONN_MAX_AGE={connection.settings_dict['CONN_MAX_AGE']} "
+                f"CONN_HEALTH_CHECKS={connection.settings_dict['CONN_HEALTH_CHECKS']} "
+                f"server-side cursors={'off' if connection.settings_dict.get('DISABLE_SERVER_SIDE_CURSORS') else 'on'}"
+            )
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'✗ Database connection: FAILED - {e}'))
 
@@ -23,4 +29,19 @@ class Command(BaseCommand):
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'✗ Redis connection: FAILED - {e}'))
 
+        # Connection reuse of the webhook HTTP pool, as reported by workers
+        try:
+            stats = published_http_stats()
+            if not stats:
+                self.stdout.write('- HTTP pool stats: no worker has reported yet')
+            for worker, worker_stats in sorted(stats.items()):
+                ratio = worker_stats['reuse_ratio']
+                self.stdout.write(
+                    f"- HTTP pool {worker}: {worker_stats['requests']} requests over "
+                    f"{worker_stats['connections']} connections to {worker_stats['hosts']} hosts "
+                    f"(reuse {'n/a' if ratio is None else f'{ratio:.0%}'})"
+                )
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'✗ HTTP pool stats: FAILED - {e}'))
+
         self.stdout.write('\nHealth check completed!')
\ No newline at end of file
@@ -0,0 +1,20 @@
+import time
+from django.core.management.base import BaseCommand
+from webhook.services.outbox_relay import drain_outbox
+
+class Command(BaseCommand):
+    help = 'Continuously relay product outbox events into the webhook pipeline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--interval', type=float, default=1.0, help='Seconds to sleep when the outbox is empty')
+        parser.add_argument('--once', action='store_true', help='Drain the outbox once and exit')
+
+    def handle(self, *args, **options):
+        while True:
+            relayed = drain_outbox(options['batch_size'])
+            if relayed:
+                self.stdout.write(f'Relayed {relayed} events')
+            if options['once']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.utils.dateparse import parse_datetime
+from product.models import ProductProduct
+from product.services.image_verifier import verify_product_images
+
+class Command(BaseCommand):
+    help = 'Verify product image URLs and record status, content type and size'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='Only products updated since this ISO timestamp')
+        parser.add_argument('--concurrency', type=int, help='Maximum concurrent requests')
+        parser.add_argument('--per-host', type=int, help='Maximum concurrent requests per host')
+        parser.add_argument('--timeout', type=float, help='Request timeout in seconds')
+
+    def handle(self, *args, **options):
+        queryset = ProductProduct.objects.all()
+        if options['since']:
+            queryset = queryset.filter(updated_at__gte=parse_datetime(options['since']))
+
+        summary = verify_product_images(
+            queryset,
+            concurrency=options['concurrency'],
+            per_host=options['per_host'],
+            timeout=options['timeout'],
+        )
+        for outcome, count in sorted(summary.items()):
+            self.stdout.write(f'{outcome}: {count}')
+        self.stdout.write(self.style.SUCCESS('Image verification completed'))
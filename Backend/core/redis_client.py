@@ -0,0 +1,11 @@
+import redis
+from django.conf import settings
+
+_client = None
+
+def get_redis():
+    """Return a process-wide Redis client for the broker instance"""
+    global _client
+    if _client is None:
+        _client = redis.from_url(settings.REDIS_URL, **settings.REDIS_OPTIONS)
+    return _client
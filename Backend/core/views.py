@@ -1,27 +1,34 @@
-from rest_framework.decorators import api_view
-from rest_framework.response import Response
+from django.db.models import Count, Q
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+from core.db_routing import replica_reads
 from product.models import ProductProduct
 from import_manager.models import ImportJob
 from webhook.models import WebhookConfig, WebhookLog
 
-@api_view(['GET'])
-def dashboard_stats(request):
+@require_GET
+@replica_reads
+async def dashboard_stats(request):
     """
     GET /api/dashboard/stats
     Get dashboard statistics
     """
-    total_products = ProductProduct.objects.count()
-    active_products = ProductProduct.objects.filter(is_active=True).count()
-    recent_imports = ImportJob.objects.filter(status='completed').count()
-    configured_webhooks = WebhookConfig.objects.filter(is_enabled=True).count()
-    total_events_sent = WebhookLog.objects.filter(success=True).count()
-    failed_events = WebhookLog.objects.filter(success=False).count()
+    products = await ProductProduct.objects.aaggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+    )
+    recent_imports = await ImportJob.objects.filter(status='completed').acount()
+    configured_webhooks = await WebhookConfig.objects.filter(is_enabled=True).acount()
+    events = await WebhookLog.objects.aaggregate(
+        sent=Count('id', filter=Q(success=True)),
+        failed=Count('id', filter=Q(success=False)),
+    )
     
-    return Response({
-        'total_products': total_products,
-        'active_products': active_products,
+    return JsonResponse({
+        'total_products': products['total'],
+        'active_products': products['active'],
         'recent_imports': recent_imports,
         'configured_webhooks': configured_webhooks,
-        'total_events_sent': total_events_sent,
-        'failed_events': failed_events,
+        'total_events_sent': events['sent'],
+        'failed_events': events['failed'],
     })
\ No newline at end of file
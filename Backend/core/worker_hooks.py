@@ -0,0 +1,75 @@
+import json
+import logging
+import os
+import socket
+import time
+from celery import signals
+from celery.concurrency import get_implementation
+from django.conf import settings
+from django.db import close_old_connections, connections
+from core.http import close_session, session_stats
+from core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+HTTP_STATS_KEY = 'worker:http-stats:{worker}'
+
+_green_pool = False
+_stats_published_at = 0
+
+@signals.worker_init.connect
+def on_worker_init(sender=None, **kwargs):
+    global _green_pool
+    _green_pool = bool(sender and getattr(get_implementation(sender.pool_cls), 'is_green', False))
+
+@signals.task_prerun.connect
+def on_task_prerun(task=None, **kwargs):
+    if getattr(task.request, 'is_eager', False):
+        return
+    # Drops connections past CONN_MAX_AGE or left broken by an earlier task;
+    # with CONN_HEALTH_CHECKS the one kept is pinged before its first query
+    close_old_connections()
+
+@signals.task_postrun.connect
+def on_task_postrun(task=None, **kwargs):
+    if getattr(task.request, 'is_eager', False):
+        return
+    if _green_pool:
+        # Django connections are per greenlet and every task runs in a new
+        # one, so they cannot persist; close instead of leaking them
+        connections.close_all()
+    else:
+        close_old_connections()
+    _publish_http_stats()
+
+@signals.worker_process_shutdown.connect
+@signals.worker_shutdown.connect
+def on_worker_shutdown(**kwargs):
+    _publish_http_stats(force=True)
+    close_session()
+    connections.close_all()
+
+def _publish_http_stats(force=False):
+    """Share this process's HTTP connection reuse counters through Redis"""
+    global _stats_published_at
+    if not force and time.monotonic() - _stats_published_at < settings.HTTP_STATS_INTERVAL:
+        return
+    _stats_published_at = time.monotonic()
+    try:
+        get_redis().set(
+            HTTP_STATS_KEY.format(worker=f'{socket.gethostname()}:{os.getpid()}'),
+            json.dumps(session_stats()),
+            ex=settings.HTTP_STATS_INTERVAL * 10,
+        )
+    except Exception as e:
+        logger.debug('Could not publish HTTP stats: %s', e)
+
+def published_http_stats():
+    """Return {worker: stats} for every worker process that reported recently"""
+    redis = get_redis()
+    keys = list(redis.scan_iter(HTTP_STATS_KEY.format(worker='*')))
+    stats = {}
+    for key, value in zip(keys, redis.mget(keys) if keys else []):
+        if value is not None:
+            stats[key.decode().split(':', 2)[2]] = json.loads(value)
+    return stats
@@ -0,0 +1,32 @@
+from contextlib import contextmanager
+from django.db import connections
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+@contextmanager
+def database_write_lock(using='default'):
+    """
+    Queue the bulk writers of a SQLite database behind one file lock.
+
+    SQLite allows a single writer, and writers that find the database locked
+    poll until the busy timeout expires. Holding this lock around their
+    write transactions makes the importer and the webhook log writer wait
+    their turn across processes instead. A no-op on other databases, for
+    in-memory databases, and inside an open transaction, where waiting here
+    could hold up the writer we are waiting for.
+    """
+    connection = connections[using]
+    name = str(connection.settings_dict['NAME'])
+    if (fcntl is None or connection.vendor != 'sqlite' or connection.in_atomic_block
+            or connection.is_in_memory_db()):
+        yield
+        return
+    with open(f'{name}.write-lock', 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('import_manager', '0002_importjob_scheduling'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='dry_run',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='preview',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='importjob',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed'), ('cancelled', 'Cancelled'), ('previewed', 'Previewed')], default='pending', max_length=20),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('import_manager', '0003_importjob_dry_run'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunSQL(
+            "UPDATE import_job SET heartbeat_at = updated_at WHERE status = 'processing'",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -1,4 +1,5 @@
 import uuid
+from django.conf import settings
 from django.db import models
 from core.models import BaseModel
 
@@ -9,7 +10,10 @@ class ImportJob(BaseModel):
         ('processing', 'Processing'),
         ('completed', 'Completed'),
         ('failed', 'Failed'),
+        ('cancelled', 'Cancelled'),
+        ('previewed', 'Previewed'),
     ]
+    ACTIVE_STATUSES = ['pending', 'processing']
     
     job_id = models.UUIDField(unique=True, default=uuid.uuid4, editable=False)
     filename = models.CharField(max_length=255)
@@ -21,10 +25,28 @@ class ImportJob(BaseModel):
     errors = models.JSONField(default=list, blank=True)
     started_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL, related_name='import_jobs'
+    )
+    file_path = models.CharField(max_length=500, blank=True)
+    # Position of the next unread row, so a job can be processed in slices
+    file_offset = models.BigIntegerField(default=0)
+    priority = models.PositiveSmallIntegerField(default=0)
+    cancel_requested = models.BooleanField(default=False)
+    # Stamped by the importer every batch; a processing job that stops
+    # stamping it no longer holds a concurrency slot
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    # Dry runs only compare the file with the catalog; the diff summary and
+    # sample changes are kept in preview until the job is promoted
+    dry_run = models.BooleanField(default=False)
+    preview = models.JSONField(null=True, blank=True)
     
     class Meta:
         db_table = 'import_job'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status']),
+        ]
     
     @property
     def progress(self):
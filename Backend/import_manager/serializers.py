@@ -8,5 +8,5 @@ class ImportJobSerializer(serializers.ModelSerializer):
         model = ImportJob
         fields = ['job_id', 'filename', 'status', 'total_rows', 'processed_rows', 
                  'success_count', 'error_count', 'errors', 'progress', 
-                 'started_at', 'completed_at', 'created_at']
+                 'cancel_requested', 'dry_run', 'preview', 'started_at', 'completed_at', 'created_at']
         read_only_fields = ['job_id', 'created_at']
\ No newline at end of file
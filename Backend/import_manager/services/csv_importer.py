@@ -1,9 +1,37 @@
 import csv
+import itertools
 from django.db import transaction
 from django.utils import timezone
+from analytics.services.rollups import record_import
+from core.write_lock import database_write_lock
 from product.models import ProductProduct
+from product.services.archive import restore_archived_products
+from product.services.response_cache import catalog_batch
 from import_manager.models import ImportJob
-from webhook.tasks import trigger_webhook_async
+
+PROGRESS_FIELDS = ['processed_rows', 'success_count', 'error_count', 'errors', 'file_offset', 'heartbeat_at']
+
+def _read_lines(file):
+    # readline() keeps file.tell() usable, unlike iterating the file object
+    while True:
+        line = file.readline()
+        if not line:
+            return
+        yield line
+
+def parse_row(row):
+    """Return the (sku, defaults) written for a CSV row; raises on an invalid row"""
+    defaults = {
+        'name': row['name'],
+        'description': row.get('description', ''),
+        'price': float(row['price']),
+    }
+    # Optional columns, as written by the product export
+    if row.get('is_active'):
+        defaults['is_active'] = row['is_active'].strip().lower() in ('true', '1', 'yes')
+    if row.get('image_url'):
+        defaults['image_url'] = row['image_url']
+    return row['sku'].upper(), defaults
 
 class CSVImporter:
     def __init__(self, job_id, file_path):
@@ -12,60 +40,105 @@ class CSVImporter:
         self.job = ImportJob.objects.get(job_id=job_id)
         self.chunk_size = 1000
     
-    def process(self):
-        """Process CSV import in chunks"""
+    def process(self, max_batches=None):
+        """
+        Process CSV import in chunks.
+        
+        With max_batches the import stops after that many chunks and returns
+        False so the caller can queue the remainder; the file offset is kept
+        on the job. Returns True once the job reached a final status.
+        """
         try:
-            self.job.status = 'processing'
-            self.job.started_at = timezone.now()
-            self.job.save()
+            if self.job.status == 'pending':
+                self.job.status = 'processing'
+                self.job.started_at = self.job.heartbeat_at = timezone.now()
+                # Promoted dry runs already counted the rows
+                if not self.job.total_rows:
+                    self.job.total_rows = self._count_rows()
+                self._save('status', 'started_at', 'heartbeat_at', 'total_rows')
             
-            with open(self.file_path, 'r') as file:
-                reader = csv.DictReader(file)
+            with open(self.file_path, 'r', newline='') as file:
+                fieldnames = next(csv.reader([file.readline()]), [])
+                if self.job.file_offset:
+                    file.seek(self.job.file_offset)
+                reader = csv.DictReader(_read_lines(file), fieldnames=fieldnames)
                 
-                # Count total rows
-                rows = list(reader)
-                self.job.total_rows = len(rows)
-                self.job.save()
-                
-                # Process in chunks
-                for i in range(0, len(rows), self.chunk_size):
-                    chunk = rows[i:i + self.chunk_size]
-                    self._process_chunk(chunk)
+                batches = 0
+                while True:
+                    # Checked between batches so cancellation never splits one
+                    if self._cancel_requested():
+                        self._finish('cancelled')
+                        return True
+                    if max_batches is not None and batches >= max_batches:
+                        return False
                     
-                    # Update progress
-                    self.job.processed_rows = min(i + self.chunk_size, len(rows))
-                    self.job.save()
+                    chunk = list(itertools.islice(reader, self.chunk_size))
+                    if not chunk:
+                        break
+                    self._process_chunk(chunk, file.tell())
+                    batches += 1
             
             # Mark as completed
-            self.job.status = 'completed'
-            self.job.completed_at = timezone.now()
-            self.job.save()
+            self._finish('completed')
             
         except Exception as e:
             self.job.status = 'failed'
             self.job.errors.append(str(e))
-            self.job.save()
+            self._save('status', 'errors')
+            record_import(jobs_failed=1)
+        return True
+    
+    def _count_rows(self):
+        with open(self.file_path, 'r', newline='') as file:
+            return max(sum(1 for _ in csv.reader(file)) - 1, 0)
+    
+    def _cancel_requested(self):
+        return ImportJob.objects.filter(pk=self.job.pk, cancel_requested=True).exists()
     
-    def _process_chunk(self, chunk):
-        """Process a chunk of CSV rows"""
+    def _finish(self, status):
+        self.job.status = status
+        self.job.completed_at = timezone.now()
+        self._save('status', 'completed_at')
+        if status == 'completed':
+            record_import(jobs_completed=1)
+    
+    def _save(self, *fields):
+        # Only write what the importer owns so a concurrent cancel request is kept
+        self.job.save(update_fields=[*fields, 'updated_at'])
+    
+    def _process_chunk(self, chunk, file_offset):
+        """Process a chunk of CSV rows in a single transaction, with the job's progress"""
+        success_count, error_count = self.job.success_count, self.job.error_count
+        with database_write_lock(), catalog_batch(), transaction.atomic():
+            # Returning SKUs get their archived product back, original id included
+            restore_archived_products([row['sku'] for row in chunk if row.get('sku')])
+            self._process_rows(chunk)
+            record_import(
+                processed_rows=len(chunk),
+                success_count=self.job.success_count - success_count,
+                error_count=self.job.error_count - error_count,
+            )
+            # Committed with the rows, so a redelivered slice resumes after them
+            self.job.processed_rows += len(chunk)
+            self.job.file_offset = file_offset
+            self.job.heartbeat_at = timezone.now()
+            self._save(*PROGRESS_FIELDS)
+    
+    def _process_rows(self, chunk):
         for row in chunk:
             try:
+                sku, defaults = parse_row(row)
+                
+                # Savepoint per row so one bad row does not roll back the
+                # batch; save() writes the webhook event to the product outbox
                 with transaction.atomic():
-                    product, created = ProductProduct.objects.update_or_create(
-                        sku=row['sku'].upper(),
-                        defaults={
-                            'name': row['name'],
-                            'description': row.get('description', ''),
-                            'price': float(row['price']),
-                        }
+                    ProductProduct.objects.update_or_create(
+                        sku=sku,
+                        defaults=defaults
                     )
                     
                     self.job.success_count += 1
                     
-                    # Trigger webhook
-                    event = 'product.created' if created else 'product.updated'
-                    trigger_webhook_async.delay(event, product.id)
-                    
             except Exception as e:
                 self.job.error_count += 1
                 self.job.errors.append({
@@ -0,0 +1,179 @@
+import csv
+import hashlib
+import itertools
+import math
+from decimal import Decimal
+from django.conf import settings
+from django.utils import timezone
+from product.models import ProductArchive, ProductProduct
+from import_manager.models import ImportJob
+from .csv_importer import parse_row
+
+COMPARED_FIELDS = ['name', 'description', 'price', 'is_active', 'image_url']
+# Values of a created product for the optional columns a row may leave out
+CREATE_DEFAULTS = {'is_active': True, 'image_url': None}
+MAX_PRICE = Decimal('99999999.99')
+CENT = Decimal('0.01')
+DIGEST_SIZE = 8
+# Repeated SKUs whose full values are kept to describe their changes; older
+# ones are still compared by fingerprint but no longer sampled
+KEPT_VALUES = 10000
+
+def _column_errors(sku, defaults):
+    # Constraints the database enforces when the row is written
+    if not sku or len(sku) > 100:
+        return 'Invalid sku'
+    if len(defaults['name']) > 255:
+        return 'Name is longer than 255 characters'
+    if not math.isfinite(defaults['price']) or abs(Decimal(str(defaults['price']))) > MAX_PRICE:
+        return 'Invalid price'
+    return None
+
+def _normalize(defaults):
+    values = dict(defaults)
+    values['price'] = Decimal(str(values['price'])).quantize(CENT)
+    return values
+
+def _jsonable(value):
+    return str(value) if isinstance(value, Decimal) else value
+
+def _digest(value):
+    return hashlib.blake2b(repr(value).encode(), digest_size=DIGEST_SIZE).digest()
+
+def _fingerprint(state):
+    """One fixed-size digest per compared field, in COMPARED_FIELDS order"""
+    return b''.join(_digest(state[field]) for field in COMPARED_FIELDS)
+
+def _field_digest(fingerprint, field):
+    start = COMPARED_FIELDS.index(field) * DIGEST_SIZE
+    return fingerprint[start:start + DIGEST_SIZE]
+
+class CSVPreviewer:
+    """
+    Dry run of a CSV import: classify every row against the catalog without writing.
+
+    Rows are parsed exactly as CSVImporter parses them and compared with the
+    existing products through one SKU lookup per chunk. The counts and a
+    sample of each kind of change are stored on the job's preview.
+    """
+
+    def __init__(self, job_id, file_path):
+        self.job_id = job_id
+        self.file_path = file_path
+        self.job = ImportJob.objects.get(job_id=job_id)
+        self.chunk_size = settings.IMPORT_PREVIEW_CHUNK_SIZE
+        self.sample_size = settings.IMPORT_PREVIEW_SAMPLE_SIZE
+        self.summary = {'created': 0, 'updated': 0, 'unchanged': 0, 'rejected': 0, 'restored': 0}
+        self.samples = {'created': [], 'updated': [], 'rejected': []}
+        # Fingerprint of every SKU's state after the rows read so far, so a
+        # repeated SKU is compared with what its earlier row wrote. Full
+        # values are only kept for recent SKUs while updated samples are
+        # still being collected.
+        self.written = {}
+        self.written_values = {}
+
+    def process(self):
+        try:
+            started = ImportJob.objects.filter(pk=self.job.pk, status='pending').update(
+                status='processing', started_at=timezone.now(), updated_at=timezone.now()
+            )
+            if not started:
+                return
+            line_number = 1
+            with open(self.file_path, 'r', newline='') as file:
+                reader = csv.DictReader(file)
+                while True:
+                    if ImportJob.objects.filter(pk=self.job.pk, cancel_requested=True).exists():
+                        self._finish('cancelled', line_number - 1)
+                        return
+                    chunk = list(itertools.islice(reader, self.chunk_size))
+                    if not chunk:
+                        break
+                    self._compare_chunk(chunk, line_number + 1)
+                    line_number += len(chunk)
+                    ImportJob.objects.filter(pk=self.job.pk).update(processed_rows=line_number - 1)
+            self._finish('previewed', line_number - 1)
+
+        except Exception as e:
+            ImportJob.objects.filter(pk=self.job.pk).update(
+                status='failed', errors=[str(e)], completed_at=timezone.now(), updated_at=timezone.now()
+            )
+
+    def _finish(self, status, rows):
+        ImportJob.objects.filter(pk=self.job.pk).update(
+            status=status,
+            total_rows=rows,
+            processed_rows=rows,
+            preview={'summary': self.summary, 'samples': self.samples},
+            completed_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+
+    def _compare_chunk(self, chunk, first_line):
+        parsed = []
+        for line, row in enumerate(chunk, first_line):
+            try:
+                sku, defaults = parse_row(row)
+                error = _column_errors(sku, defaults)
+            except Exception as e:
+                error = str(e)
+            if error:
+                self._add('rejected', {'line': line, 'row': row, 'error': error})
+                continue
+            parsed.append((sku, _normalize(defaults)))
+
+        skus = {sku for sku, _ in parsed}
+        existing = {
+            product['sku']: product
+            for product in ProductProduct.objects.filter(sku__in=skus).values('sku', *COMPARED_FIELDS)
+        }
+        archived = {
+            product['sku']: product
+            for product in ProductArchive.objects.filter(sku__in=skus - existing.keys())
+            .values('sku', *COMPARED_FIELDS)
+        }
+
+        for sku, values in parsed:
+            if sku in self.written:
+                fingerprint = self.written[sku]
+                current = self.written_values.pop(sku, None)
+            elif sku in existing or sku in archived:
+                if sku in archived:
+                    self.summary['restored'] += 1
+                current = existing.get(sku) or archived[sku]
+                fingerprint = _fingerprint(current)
+            else:
+                current = {**CREATE_DEFAULTS, **values}
+                self._remember(sku, _fingerprint(current), current)
+                self._add('created', {'sku': sku, **{field: _jsonable(value) for field, value in values.items()}})
+                continue
+
+            digests = {field: _digest(value) for field, value in values.items()}
+            changed = [field for field, digest in digests.items() if _field_digest(fingerprint, field) != digest]
+            fingerprint = b''.join(digests.get(field) or _field_digest(fingerprint, field) for field in COMPARED_FIELDS)
+            if not changed:
+                self.summary['unchanged'] += 1
+            elif current is None:
+                # Changed since an earlier row whose values were not kept
+                self.summary['updated'] += 1
+            else:
+                self._add('updated', {
+                    'sku': sku,
+                    'changes': {field: [_jsonable(current[field]), _jsonable(values[field])] for field in changed},
+                })
+            self._remember(sku, fingerprint, current and {**current, **values})
+
+    def _remember(self, sku, fingerprint, values):
+        self.written[sku] = fingerprint
+        if len(self.samples['updated']) >= self.sample_size:
+            self.written_values.clear()
+            return
+        if values is not None:
+            self.written_values[sku] = values
+            if len(self.written_values) > KEPT_VALUES:
+                del self.written_values[next(iter(self.written_values))]
+
+    def _add(self, kind, sample):
+        self.summary[kind] += 1
+        if len(self.samples[kind]) < self.sample_size:
+            self.samples[kind].append(sample)
@@ -0,0 +1,70 @@
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+from import_manager.models import ImportJob
+
+# Redis transport priorities: 0 is served first
+PRIORITY_BY_SIZE = [
+    (1024 * 1024, 0),
+    (50 * 1024 * 1024, 3),
+]
+LOWEST_PRIORITY = 6
+
+def job_priority(file_size):
+    """Smaller uploads get a higher queue priority so they are not stuck behind large ones"""
+    for max_size, priority in PRIORITY_BY_SIZE:
+        if file_size <= max_size:
+            return priority
+    return LOWEST_PRIORITY
+
+def has_capacity(job):
+    """
+    Whether a pending job may start under the global and per-user caps.
+
+    The check is not locked, so concurrent admissions can briefly exceed
+    a cap by the number of workers racing for it. Processing jobs whose
+    heartbeat is older than IMPORT_STALE_AFTER_SECONDS are not counted, so
+    a job left behind by a dead worker does not hold its slot forever.
+    """
+    stale_before = timezone.now() - timedelta(seconds=settings.IMPORT_STALE_AFTER_SECONDS)
+    running = ImportJob.objects.filter(status='processing', heartbeat_at__gte=stale_before)
+    if running.count() >= settings.IMPORT_MAX_CONCURRENT_JOBS:
+        return False
+    return running.filter(created_by_id=job.created_by_id).count() < settings.IMPORT_MAX_CONCURRENT_JOBS_PER_USER
+
+def cancel_job(job):
+    """
+    Request cancellation of an import job.
+
+    Pending jobs are cancelled immediately; running jobs stop at the next
+    batch boundary when CSVImporter sees the flag. Returns False when the
+    job already reached a final status.
+    """
+    if job.status not in ImportJob.ACTIVE_STATUSES:
+        return False
+    ImportJob.objects.filter(pk=job.pk).update(cancel_requested=True)
+    ImportJob.objects.filter(pk=job.pk, status='pending').update(
+        status='cancelled', completed_at=timezone.now()
+    )
+    job.refresh_from_db()
+    return True
+
+
+def promote_job(job):
+    """
+    Turn a previewed dry run into a real import of the same file.
+
+    The row count from the preview is kept so the import does not count
+    the file again. Returns False unless the job is a finished dry run.
+    """
+    promoted = ImportJob.objects.filter(pk=job.pk, dry_run=True, status='previewed').update(
+        dry_run=False,
+        status='pending',
+        processed_rows=0,
+        file_offset=0,
+        started_at=None,
+        completed_at=None,
+        updated_at=timezone.now(),
+    )
+    job.refresh_from_db()
+    return bool(promoted)
\ No newline at end of file
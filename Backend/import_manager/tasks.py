@@ -1,11 +1,44 @@
 from celery import shared_task
+from django.conf import settings
+from product.tasks import verify_images_async
+from .models import ImportJob
 from .services.csv_importer import CSVImporter
+from .services.csv_preview import CSVPreviewer
+from .services.scheduler import has_capacity
 
-@shared_task
+# Acked once the slice is done, so a slice lost with its worker is redelivered
+# and resumes from the job's saved offset
+@shared_task(acks_late=True, reject_on_worker_lost=True)
 def process_csv_import(job_id, file_path):
     """
     Process CSV import asynchronously
+    
+    Each run handles IMPORT_BATCHES_PER_SLICE batches and re-queues the job
+    at the back of the imports queue, so concurrent jobs are interleaved.
     """
+    job = ImportJob.objects.filter(job_id=job_id).first()
+    if job is None or job.status not in ImportJob.ACTIVE_STATUSES:
+        return f"Import job {job_id} skipped"
+    
+    if job.status == 'pending' and not job.cancel_requested and not has_capacity(job):
+        process_csv_import.apply_async(
+            args=[job_id, file_path],
+            countdown=settings.IMPORT_ADMISSION_RETRY_SECONDS,
+            priority=job.priority,
+        )
+        return f"Import job {job_id} waiting for capacity"
+    
     importer = CSVImporter(job_id, file_path)
-    importer.process()
-    return f"Import job {job_id} completed"
\ No newline at end of file
+    if not importer.process(max_batches=settings.IMPORT_BATCHES_PER_SLICE):
+        process_csv_import.apply_async(args=[job_id, file_path], priority=job.priority)
+        return f"Import job {job_id} re-queued"
+    
+    if importer.job.status == 'completed':
+        verify_images_async.delay(importer.job.started_at.isoformat())
+    return f"Import job {job_id} completed"
+
+@shared_task
+def preview_csv_import(job_id, file_path):
+    """Compare a dry-run upload with the catalog without writing products"""
+    CSVPreviewer(job_id, file_path).process()
+    return f"Import job {job_id} previewed"
\ No newline at end of file
@@ -0,0 +1,112 @@
+import os
+import tempfile
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from import_manager.models import ImportJob
+from import_manager.services.csv_importer import CSVImporter
+from import_manager.services.csv_preview import CSVPreviewer
+from import_manager.services.scheduler import cancel_job, has_capacity, promote_job
+from product.models import ProductProduct
+
+class CSVFileMixin:
+    def _write_csv(self, *lines):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as file:
+            file.write('sku,name,description,price\n' + '\n'.join(lines) + '\n')
+        self.addCleanup(os.remove, file.name)
+        return file.name
+
+@override_settings(IMPORT_PREVIEW_CHUNK_SIZE=1)
+class CSVPreviewTests(CSVFileMixin, TestCase):
+    def _preview(self, *lines):
+        path = self._write_csv(*lines)
+        job = ImportJob.objects.create(filename='preview.csv', file_path=path, dry_run=True)
+        CSVPreviewer(job.job_id, path).process()
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'previewed')
+        return job.preview
+
+    def test_repeated_existing_sku_is_compared_with_its_earlier_row(self):
+        ProductProduct.objects.create(sku='A', name='Widget', description='', price=10)
+
+        preview = self._preview('A,Widget,,12', 'A,Widget,,12')
+
+        self.assertEqual(preview['summary']['updated'], 1)
+        self.assertEqual(preview['summary']['unchanged'], 1)
+        self.assertEqual(preview['samples']['updated'], [{'sku': 'A', 'changes': {'price': ['10.00', '12.00']}}])
+
+    def test_repeated_new_sku_reports_changes(self):
+        preview = self._preview('B,First,,5', 'B,First,,6', 'B,First,,6')
+
+        self.assertEqual(preview['summary']['created'], 1)
+        self.assertEqual(preview['summary']['updated'], 1)
+        self.assertEqual(preview['summary']['unchanged'], 1)
+        self.assertEqual(preview['samples']['updated'], [{'sku': 'B', 'changes': {'price': ['5.00', '6.00']}}])
+
+    @override_settings(IMPORT_PREVIEW_SAMPLE_SIZE=1)
+    def test_repeated_skus_are_compared_after_values_are_dropped(self):
+        preview = self._preview('A,Widget,,1', 'B,Widget,,1', 'B,Widget,,2', 'A,Widget,,1', 'A,Widget,,3')
+
+        self.assertEqual(preview['summary']['created'], 2)
+        self.assertEqual(preview['summary']['updated'], 2)
+        self.assertEqual(preview['summary']['unchanged'], 1)
+        self.assertEqual(preview['samples']['updated'], [{'sku': 'B', 'changes': {'price': ['1.00', '2.00']}}])
+
+class SchedulingTests(CSVFileMixin, TestCase):
+    def _job(self, **fields):
+        path = self._write_csv(*(f'S{i},Item {i},,{i}' for i in range(5)))
+        return ImportJob.objects.create(filename='import.csv', file_path=path, **fields)
+
+    def _slice(self, job):
+        importer = CSVImporter(job.job_id, job.file_path)
+        importer.chunk_size = 2
+        done = importer.process(max_batches=1)
+        job.refresh_from_db()
+        return done
+
+    def test_slices_resume_from_saved_offset(self):
+        job = self._job()
+
+        self.assertFalse(self._slice(job))
+        self.assertEqual((job.status, job.total_rows, job.processed_rows), ('processing', 5, 2))
+        self.assertIsNotNone(job.heartbeat_at)
+        self.assertFalse(self._slice(job))
+        self.assertEqual(job.processed_rows, 4)
+        while not self._slice(job):
+            pass
+
+        self.assertEqual((job.status, job.processed_rows, job.success_count), ('completed', 5, 5))
+        self.assertEqual(ProductProduct.objects.count(), 5)
+
+    def test_cancel_pending_job(self):
+        job = self._job()
+
+        self.assertTrue(cancel_job(job))
+        self.assertEqual(job.status, 'cancelled')
+        self.assertFalse(cancel_job(job))
+
+    def test_cancel_running_job_stops_at_batch_boundary(self):
+        job = self._job()
+        self._slice(job)
+
+        self.assertTrue(cancel_job(job))
+        self.assertEqual(job.status, 'processing')
+        self.assertTrue(self._slice(job))
+        self.assertEqual((job.status, job.processed_rows), ('cancelled', 2))
+
+    def test_promote_previewed_dry_run(self):
+        job = self._job(dry_run=True, status='previewed', total_rows=5)
+
+        self.assertTrue(promote_job(job))
+        self.assertEqual((job.status, job.dry_run, job.total_rows), ('pending', False, 5))
+        self.assertFalse(promote_job(job))
+
+    @override_settings(IMPORT_MAX_CONCURRENT_JOBS=1, IMPORT_STALE_AFTER_SECONDS=600)
+    def test_stale_processing_job_releases_its_slot(self):
+        running = self._job(status='processing', heartbeat_at=timezone.now())
+        waiting = self._job()
+        self.assertFalse(has_capacity(waiting))
+
+        running.heartbeat_at = timezone.now() - timedelta(seconds=601)
+        running.save(update_fields=['heartbeat_at'])
+        self.assertTrue(has_capacity(waiting))
@@ -1,8 +1,10 @@
 from django.urls import path
-from .views import upload_csv, job_progress, jobs_list
+from .views import upload_csv, job_progress, job_cancel, job_promote, jobs_list
 
 urlpatterns = [
     path('upload', upload_csv, name='upload_csv'),
     path('jobs', jobs_list, name='jobs_list'),
     path('jobs/<uuid:job_id>', job_progress, name='job_progress'),
+    path('jobs/<uuid:job_id>/cancel', job_cancel, name='job_cancel'),
+    path('jobs/<uuid:job_id>/promote', job_promote, name='job_promote'),
 ]
\ No newline at end of file
@@ -1,16 +1,21 @@
 import uuid
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.http import require_GET
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
+from core.db_routing import replica_reads
+from product.services.fast_serializer import render_json
 from .models import ImportJob
 from .serializers import ImportJobSerializer
-from .tasks import process_csv_import
+from .services.scheduler import cancel_job, job_priority, promote_job
+from .tasks import preview_csv_import, process_csv_import
 
 @api_view(['POST'])
 def upload_csv(request):
     """
     POST /api/upload
-    Upload CSV file and start import job
+    Upload CSV file and start import job, or only preview it with dry_run=true
     """
     if 'file' not in request.FILES:
         return Response({'error': 'No file provided'}, status=status.HTTP_400_BAD_REQUEST)
@@ -20,18 +25,11 @@ def upload_csv(request):
     if not file.name.endswith('.csv'):
         return Response({'error': 'Only CSV files are allowed'}, status=status.HTTP_400_BAD_REQUEST)
     
-    # Create import job
-    job_id = uuid.uuid4()
-    import_job = ImportJob.objects.create(
-        job_id=job_id,
-        filename=file.name,
-        status='pending'
-    )
-    
     # Save file temporarily and trigger Celery task
     import tempfile
     import os
     
+    job_id = uuid.uuid4()
     temp_dir = tempfile.gettempdir()
     file_path = os.path.join(temp_dir, f'{job_id}.csv')
     
@@ -39,28 +37,86 @@ def upload_csv(request):
         for chunk in file.chunks():
             destination.write(chunk)
     
+    dry_run = str(request.query_params.get('dry_run', request.data.get('dry_run', ''))).lower() in ('true', '1', 'yes')
+    
+    # Create import job
+    import_job = ImportJob.objects.create(
+        job_id=job_id,
+        filename=file.name,
+        status='pending',
+        created_by=request.user if request.user.is_authenticated else None,
+        file_path=file_path,
+        priority=job_priority(file.size),
+        dry_run=dry_run,
+    )
+    
+    if dry_run:
+        preview_csv_import.delay(str(job_id), file_path)
+        return Response({
+            'job_id': str(job_id),
+            'message': 'Dry run started'
+        }, status=status.HTTP_202_ACCEPTED)
+    
     # Start async processing
-    process_csv_import.delay(str(job_id), file_path)
+    process_csv_import.apply_async(args=[str(job_id), file_path], priority=import_job.priority)
     
     return Response({
         'job_id': str(job_id),
         'message': 'Upload started successfully'
     }, status=status.HTTP_202_ACCEPTED)
 
-@api_view(['GET'])
-def job_progress(request, job_id):
+@require_GET
+async def job_progress(request, job_id):
     """
     GET /api/jobs/{job_id}
     Get import job progress
     """
+    try:
+        job = await ImportJob.objects.aget(job_id=job_id)
+    except ImportJob.DoesNotExist:
+        return JsonResponse({'error': 'Job not found'}, status=404)
+    
+    serializer = ImportJobSerializer(job)
+    return HttpResponse(render_json(serializer.data), content_type='application/json')
+
+@api_view(['POST'])
+def job_cancel(request, job_id):
+    """
+    POST /api/jobs/{job_id}/cancel
+    Cancel a pending or running import job
+    """
     try:
         job = ImportJob.objects.get(job_id=job_id)
-        serializer = ImportJobSerializer(job)
-        return Response(serializer.data)
     except ImportJob.DoesNotExist:
         return Response({'error': 'Job not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    if not cancel_job(job):
+        return Response({'error': f'Job is already {job.status}'}, status=status.HTTP_409_CONFLICT)
+    
+    serializer = ImportJobSerializer(job)
+    return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+@api_view(['POST'])
+def job_promote(request, job_id):
+    """
+    POST /api/jobs/{job_id}/promote
+    Run a previewed dry run as a real import
+    """
+    try:
+        job = ImportJob.objects.get(job_id=job_id)
+    except ImportJob.DoesNotExist:
+        return Response({'error': 'Job not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    if not promote_job(job):
+        return Response({'error': 'Only a previewed dry run can be promoted'}, status=status.HTTP_409_CONFLICT)
+    
+    process_csv_import.apply_async(args=[str(job.job_id), job.file_path], priority=job.priority)
+    
+    serializer = ImportJobSerializer(job)
+    return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
 
 @api_view(['GET'])
+@replica_reads
 def jobs_list(request):
     """
     GET /api/jobs
@@ -1,9 +1,30 @@
 from django.contrib import admin
-from .models import ProductProduct
+from .models import ProductArchive, ProductProduct, ProductChange, ProductEvent
 
 @admin.register(ProductProduct)
 class ProductProductAdmin(admin.ModelAdmin):
     list_display = ['sku', 'name', 'price', 'is_active', 'created_at']
     list_filter = ['is_active', 'created_at']
     search_fields = ['sku', 'name']
-    ordering = ['-created_at']
\ No newline at end of file
+    ordering = ['-created_at']
+
+@admin.register(ProductChange)
+class ProductChangeAdmin(admin.ModelAdmin):
+    list_display = ['id', 'sequence', 'product_id', 'sku', 'operation', 'created_at']
+    list_filter = ['operation']
+    search_fields = ['sku']
+    ordering = ['-id']
+    readonly_fields = ['product_id', 'sku', 'operation', 'sequence', 'created_at']
+
+@admin.register(ProductEvent)
+class ProductEventAdmin(admin.ModelAdmin):
+    list_display = ['id', 'event_type', 'product_id', 'created_at']
+    list_filter = ['event_type']
+    ordering = ['id']
+    readonly_fields = ['event_type', 'product_id', 'data', 'created_at']
+
+@admin.register(ProductArchive)
+class ProductArchiveAdmin(admin.ModelAdmin):
+    list_display = ['sku', 'name', 'price', 'updated_at', 'archived_at']
+    search_fields = ['sku', 'name']
+    ordering = ['-archived_at']
\ No newline at end of file
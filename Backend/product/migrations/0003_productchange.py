@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0002_productproduct_image_url'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('product_id', models.BigIntegerField()),
+                ('sku', models.CharField(max_length=100)),
+                ('operation', models.CharField(choices=[('upsert', 'Upsert'), ('delete', 'Delete')], max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'product_change',
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0003_productchange'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(max_length=50)),
+                ('product_id', models.BigIntegerField()),
+                ('data', models.JSONField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'product_event_outbox',
+                'ordering': ['id'],
+            },
+        ),
+    ]
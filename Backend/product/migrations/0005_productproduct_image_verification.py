@@ -0,0 +1,48 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0004_productevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productproduct',
+            name='image_checked_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='productproduct',
+            name='image_checked_url',
+            field=models.URLField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='productproduct',
+            name='image_content_type',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='productproduct',
+            name='image_etag',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='productproduct',
+            name='image_last_modified',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='productproduct',
+            name='image_size',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='productproduct',
+            name='image_status',
+            field=models.CharField(blank=True, choices=[('ok', 'OK'), ('invalid', 'Not an image'), ('broken', 'Broken'), ('unreachable', 'Unreachable')], max_length=20, null=True),
+        ),
+    ]
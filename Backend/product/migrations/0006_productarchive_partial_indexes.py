@@ -0,0 +1,63 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0005_productproduct_image_verification'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('sku', models.CharField(max_length=100, unique=True)),
+                ('name', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('image_url', models.URLField(blank=True, null=True)),
+                ('image_status', models.CharField(blank=True, max_length=20, null=True)),
+                ('image_content_type', models.CharField(blank=True, max_length=100, null=True)),
+                ('image_size', models.BigIntegerField(blank=True, null=True)),
+                ('image_etag', models.CharField(blank=True, max_length=255, null=True)),
+                ('image_last_modified', models.CharField(blank=True, max_length=64, null=True)),
+                ('image_checked_url', models.URLField(blank=True, null=True)),
+                ('image_checked_at', models.DateTimeField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'product_product_archive',
+                'ordering': ['-archived_at'],
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='productproduct',
+            name='product_pro_sku_34f508_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='productproduct',
+            name='product_pro_name_b60cd1_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='productproduct',
+            name='product_pro_is_acti_9d034c_idx',
+        ),
+        migrations.AddIndex(
+            model_name='productproduct',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['sku'], name='product_active_sku_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productproduct',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['name'], name='product_active_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productproduct',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at'], name='product_active_created_idx'),
+        ),
+    ]
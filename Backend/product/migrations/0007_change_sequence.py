@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0006_productarchive_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productchange',
+            name='sequence',
+            field=models.BigIntegerField(blank=True, null=True, unique=True),
+        ),
+        # Existing cursors are ids, so already committed changes keep them as sequence
+        migrations.RunSQL(
+            'UPDATE product_change SET sequence = id',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='productchange',
+            index=models.Index(condition=models.Q(('sequence__isnull', True)), fields=['id'], name='product_change_unsequenced_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0007_change_sequence'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='productproduct',
+            index=models.Index(fields=['name'], name='product_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productproduct',
+            index=models.Index(fields=['-created_at'], name='product_created_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:48
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0008_plain_list_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='productproduct',
+            name='product_active_sku_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='productproduct',
+            name='product_active_name_idx',
+        ),
+    ]
@@ -1,3 +1,6 @@
 from .product_product import ProductProduct
+from .product_change import ProductChange
+from .product_event import ProductEvent
+from .product_archive import ProductArchive
 
-__all__ = ['ProductProduct']
\ No newline at end of file
+__all__ = ['ProductProduct', 'ProductChange', 'ProductEvent', 'ProductArchive']
@@ -0,0 +1,33 @@
+from django.db import models
+
+class ProductArchive(models.Model):
+    """
+    Cold storage for long-inactive products.
+
+    Mirrors ProductProduct column for column, keeping the original id and
+    timestamps so a product can be moved back unchanged.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    sku = models.CharField(max_length=100, unique=True)
+    name = models.CharField(max_length=255)
+    description = models.TextField(null=True, blank=True)
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    image_url = models.URLField(null=True, blank=True)
+    image_status = models.CharField(max_length=20, null=True, blank=True)
+    image_content_type = models.CharField(max_length=100, null=True, blank=True)
+    image_size = models.BigIntegerField(null=True, blank=True)
+    image_etag = models.CharField(max_length=255, null=True, blank=True)
+    image_last_modified = models.CharField(max_length=64, null=True, blank=True)
+    image_checked_url = models.URLField(null=True, blank=True)
+    image_checked_at = models.DateTimeField(null=True, blank=True)
+    is_active = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'product_product_archive'
+        ordering = ['-archived_at']
+    
+    def __str__(self):
+        return f"{self.sku} - {self.name} (archived)"
\ No newline at end of file
@@ -0,0 +1,46 @@
+from django.db import models
+
+class ProductChange(models.Model):
+    """
+    Append-only product change log.
+
+    The change feed pages by sequence, which the sequencer task assigns
+    after the row commits (see change_feed.sequence_changes), so it follows
+    commit order rather than the insert order of the id.
+    """
+    OPERATION_UPSERT = 'upsert'
+    OPERATION_DELETE = 'delete'
+    OPERATION_CHOICES = [
+        (OPERATION_UPSERT, 'Upsert'),
+        (OPERATION_DELETE, 'Delete'),
+    ]
+    
+    # Plain ids rather than a foreign key so tombstones outlive the product
+    product_id = models.BigIntegerField()
+    sku = models.CharField(max_length=100)
+    operation = models.CharField(max_length=10, choices=OPERATION_CHOICES)
+    sequence = models.BigIntegerField(null=True, blank=True, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'product_change'
+        ordering = ['id']
+        indexes = [
+            models.Index(
+                fields=['id'],
+                condition=models.Q(sequence__isnull=True),
+                name='product_change_unsequenced_idx',
+            ),
+        ]
+    
+    def __str__(self):
+        return f"#{self.id} {self.operation} {self.sku}"
+    
+    @classmethod
+    def record(cls, changes, batch_size=1000):
+        """Append (product_id, sku, operation) tuples to the change log"""
+        cls.objects.bulk_create(
+            [cls(product_id=product_id, sku=sku, operation=operation)
+             for product_id, sku, operation in changes],
+            batch_size=batch_size,
+        )
@@ -0,0 +1,29 @@
+from django.db import models
+
+class ProductEvent(models.Model):
+    """Transactional outbox of product events awaiting webhook delivery"""
+    EVENT_CREATED = 'product.created'
+    EVENT_UPDATED = 'product.updated'
+    EVENT_DELETED = 'product.deleted'
+    
+    event_type = models.CharField(max_length=50)
+    product_id = models.BigIntegerField()
+    # Snapshot of the product, kept for deletes where it can no longer be read
+    data = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'product_event_outbox'
+        ordering = ['id']
+    
+    def __str__(self):
+        return f"{self.event_type} #{self.product_id}"
+    
+    @classmethod
+    def enqueue(cls, events, batch_size=1000):
+        """Write (event_type, product_id, data) tuples to the outbox"""
+        cls.objects.bulk_create(
+            [cls(event_type=event_type, product_id=product_id, data=data)
+             for event_type, product_id, data in events],
+            batch_size=batch_size,
+        )
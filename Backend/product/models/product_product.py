@@ -1,5 +1,9 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Q
 from core.models import BaseModel
+from product.services.response_cache import bump_catalog_generation
+from .product_change import ProductChange
+from .product_event import ProductEvent
 
 class ProductProduct(BaseModel):
     """Product model - stores individual products"""
@@ -9,19 +13,65 @@ class ProductProduct(BaseModel):
     price = models.DecimalField(max_digits=10, decimal_places=2)
     image_url = models.URLField(null=True, blank=True)
     
+    # Result of the last image_url verification
+    IMAGE_STATUS_CHOICES = [
+        ('ok', 'OK'),
+        ('invalid', 'Not an image'),
+        ('broken', 'Broken'),
+        ('unreachable', 'Unreachable'),
+    ]
+    image_status = models.CharField(max_length=20, choices=IMAGE_STATUS_CHOICES, null=True, blank=True)
+    image_content_type = models.CharField(max_length=100, null=True, blank=True)
+    image_size = models.BigIntegerField(null=True, blank=True)
+    # Validators for conditional requests; only valid for image_checked_url
+    image_etag = models.CharField(max_length=255, null=True, blank=True)
+    image_last_modified = models.CharField(max_length=64, null=True, blank=True)
+    image_checked_url = models.URLField(null=True, blank=True)
+    image_checked_at = models.DateTimeField(null=True, blank=True)
+    
     class Meta:
         db_table = 'product_product'
         ordering = ['-created_at']
+        # The partial index serves the list filtered on is_active=True from
+        # the live catalog only; the unfiltered list and ordering use the
+        # plain ones. Inactive rows are archived over time, keeping it small.
         indexes = [
-            models.Index(fields=['sku']),
-            models.Index(fields=['name']),
-            models.Index(fields=['is_active']),
+            models.Index(fields=['name'], name='product_name_idx'),
+            models.Index(fields=['-created_at'], name='product_created_idx'),
+            models.Index(fields=['-created_at'], name='product_active_created_idx', condition=Q(is_active=True)),
         ]
     
     def __str__(self):
         return f"{self.sku} - {self.name}"
     
+    def event_data(self):
+        """Product representation sent in webhook payloads"""
+        return {
+            'id': self.id,
+            'sku': self.sku,
+            'name': self.name,
+            'description': self.description,
+            'price': float(self.price),
+            'is_active': self.is_active,
+        }
+    
     def save(self, *args, **kwargs):
         # Ensure SKU is case-insensitive unique
         self.sku = self.sku.upper()
-        super().save(*args, **kwargs)
\ No newline at end of file
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            ProductChange.record([(self.pk, self.sku, ProductChange.OPERATION_UPSERT)])
+            event_type = ProductEvent.EVENT_CREATED if adding else ProductEvent.EVENT_UPDATED
+            ProductEvent.enqueue([(event_type, self.pk, None)])
+        bump_catalog_generation()
+    
+    def delete(self, *args, **kwargs):
+        product_id = self.pk
+        data = self.event_data()
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            ProductChange.record([(product_id, self.sku, ProductChange.OPERATION_DELETE)])
+            ProductEvent.enqueue([(ProductEvent.EVENT_DELETED, product_id, data)])
+        bump_catalog_generation()
+        return result
\ No newline at end of file
@@ -10,4 +10,15 @@ class ProductSerializer(serializers.ModelSerializer):
     def validate_price(self, value):
         if value <= 0:
             raise serializers.ValidationError("Price must be greater than 0")
-        return value
\ No newline at end of file
+        return value
+
+class ProductBulkItemSerializer(ProductSerializer):
+    """
+    Field rules for one bulk upsert/update item.
+
+    Used field by field; the SKU's uniqueness is resolved by the upsert
+    itself, so its unique validator is left out.
+    """
+    class Meta(ProductSerializer.Meta):
+        fields = ['sku', 'name', 'description', 'price', 'is_active', 'image_url']
+        extra_kwargs = {'sku': {'validators': []}}
@@ -0,0 +1,78 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from product.models import ProductArchive, ProductProduct
+from product.services.response_cache import bump_catalog_generation
+
+def _copy(source, model):
+    """Build a model instance with the same column values as source"""
+    return model(**{
+        field.attname: getattr(source, field.attname)
+        for field in model._meta.concrete_fields
+        if hasattr(source, field.attname)
+    })
+
+def archive_inactive_products(inactive_days=None, batch_size=None):
+    """
+    Move products inactive for longer than inactive_days to the archive table.
+
+    Works through the table in id order, one transaction per batch, so it
+    never holds locks for long. Archiving is not a catalog change, so no
+    change log or webhook events are written. Returns the number archived.
+    """
+    inactive_days = settings.PRODUCT_ARCHIVE_AFTER_DAYS if inactive_days is None else inactive_days
+    batch_size = batch_size or settings.PRODUCT_ARCHIVE_BATCH_SIZE
+    cutoff = timezone.now() - timedelta(days=inactive_days)
+    archived = 0
+    last_id = 0
+
+    while True:
+        with transaction.atomic():
+            products = list(
+                ProductProduct.objects.select_for_update(skip_locked=True)
+                .filter(id__gt=last_id, is_active=False, updated_at__lt=cutoff)
+                .order_by('id')[:batch_size]
+            )
+            if not products:
+                break
+            last_id = products[-1].id
+
+            # A SKU archived before, recreated and now archived again replaces its stale copy
+            ProductArchive.objects.filter(sku__in=[product.sku for product in products]).delete()
+            ProductArchive.objects.bulk_create([_copy(product, ProductArchive) for product in products])
+            # A queryset delete bypasses ProductProduct.delete() and its events
+            ProductProduct.objects.filter(id__in=[product.id for product in products]).delete()
+        archived += len(products)
+
+    if archived:
+        bump_catalog_generation()
+    return archived
+
+def restore_archived_products(skus):
+    """
+    Move archived products with the given SKUs back to the product table.
+
+    Products keep their original id and fields, so a returning SKU is
+    updated in place rather than created anew. Must run inside the
+    caller's transaction. Returns the number restored.
+    """
+    archived = list(ProductArchive.objects.select_for_update().filter(sku__in=[sku.upper() for sku in skus]))
+    if not archived:
+        return 0
+
+    # A SKU recreated while archived keeps the live row; the copy is dropped
+    live_skus = set(
+        ProductProduct.objects.filter(sku__in=[product.sku for product in archived])
+        .values_list('sku', flat=True)
+    )
+    restored = [_copy(product, ProductProduct) for product in archived if product.sku not in live_skus]
+    if restored:
+        timestamps = [(product.created_at, product.updated_at) for product in restored]
+        ProductProduct.objects.bulk_create(restored)
+        # bulk_create applies auto_now; put the original timestamps back
+        for product, (created_at, updated_at) in zip(restored, timestamps):
+            product.created_at, product.updated_at = created_at, updated_at
+        ProductProduct.objects.bulk_update(restored, ['created_at', 'updated_at'])
+    ProductArchive.objects.filter(id__in=[product.id for product in archived]).delete()
+    return len(restored)
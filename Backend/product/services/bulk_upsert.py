@@ -0,0 +1,245 @@
+import codecs
+import functools
+import json
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import serializers
+from product.models import ProductChange, ProductEvent, ProductProduct
+from product.serializers import ProductBulkItemSerializer
+from product.services.archive import restore_archived_products
+from product.services.response_cache import bump_catalog_generation
+
+UPDATABLE_FIELDS = ['name', 'description', 'price', 'is_active', 'image_url']
+# Attempts per batch when concurrent writers keep creating its SKUs
+WRITE_ATTEMPTS = 3
+
+class BulkRequestError(ValueError):
+    """Raised when the request body cannot be processed as a whole"""
+
+def iter_json_items(stream, content_type='', chunk_size=64 * 1024):
+    """
+    Yield items from a JSON array or NDJSON body without reading it whole.
+
+    Only one chunk plus the item being decoded is held in memory.
+    """
+    if not stream:
+        return
+    if 'ndjson' in content_type:
+        for line in _iter_lines(stream, chunk_size):
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    raise BulkRequestError(f'Invalid JSON line: {e}')
+        return
+    yield from _iter_json_array(stream, chunk_size)
+
+def _iter_lines(stream, chunk_size):
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    pending = ''
+    while True:
+        data = stream.read(chunk_size)
+        pending += decoder.decode(data, final=not data)
+        *lines, pending = pending.split('\n')
+        yield from lines
+        if not data:
+            break
+    if pending:
+        yield pending
+
+def _iter_json_array(stream, chunk_size):
+    json_decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    eof = False
+    started = False
+    expect_item = True
+
+    while True:
+        buffer = buffer.lstrip()
+        if buffer:
+            if not started:
+                if buffer[0] != '[':
+                    raise BulkRequestError('Expected a JSON array or NDJSON body')
+                buffer = buffer[1:]
+                started = True
+                continue
+            if buffer[0] == ']':
+                return
+            if buffer[0] == ',' and not expect_item:
+                buffer = buffer[1:]
+                expect_item = True
+                continue
+            if expect_item:
+                try:
+                    item, end = json_decoder.raw_decode(buffer)
+                except ValueError as e:
+                    if eof:
+                        raise BulkRequestError(f'Invalid JSON: {e}')
+                else:
+                    yield item
+                    buffer = buffer[end:]
+                    expect_item = False
+                    continue
+            else:
+                raise BulkRequestError('Invalid JSON: expected "," or "]"')
+        if eof:
+            raise BulkRequestError('Invalid JSON: unexpected end of body')
+        data = stream.read(chunk_size)
+        eof = not data
+        buffer += text_decoder.decode(data, final=eof)
+
+@functools.lru_cache(maxsize=None)
+def _item_serializer():
+    return ProductBulkItemSerializer()
+
+def validate_item(item, partial=False):
+    """
+    Validate one bulk item with the API serializer's field rules.
+
+    Returns (cleaned, errors); upserts require name and price, partial
+    updates only the sku plus at least one field to change. Values are
+    cleaned exactly as the product API cleans them, whitespace trimming
+    included.
+    """
+    if not isinstance(item, dict):
+        return None, {'non_field_errors': 'Expected an object'}
+
+    serializer = _item_serializer()
+    errors = {}
+    cleaned = {}
+
+    for name, field in serializer.fields.items():
+        if name not in item:
+            if field.required and (name == 'sku' or not partial):
+                errors[name] = str(field.error_messages['required'])
+            continue
+        try:
+            value = field.run_validation(item[name])
+            if name == 'price':
+                value = serializer.validate_price(value)
+        except serializers.ValidationError as e:
+            errors[name] = str(e.detail[0])
+            continue
+        cleaned[name] = value
+
+    if 'sku' in cleaned:
+        cleaned['sku'] = cleaned['sku'].upper()
+    if 'image_url' in cleaned:
+        cleaned['image_url'] = cleaned['image_url'] or None
+
+    if partial and not errors and len(cleaned) == 1:
+        errors['non_field_errors'] = 'No fields to update.'
+
+    return cleaned, errors
+
+def bulk_write(items, partial=False):
+    """
+    Validate and write products keyed by SKU.
+
+    Valid items are written in batches of BULK_UPSERT_BATCH_SIZE, each in its
+    own transaction with bulk_create/bulk_update plus the change log and
+    outbox rows the model's save() would write. Returns per-item results in
+    request order.
+    """
+    results = []
+    batch = []
+    seen_skus = set()
+
+    for index, item in enumerate(items):
+        if index >= settings.BULK_UPSERT_MAX_ITEMS:
+            raise BulkRequestError(f'At most {settings.BULK_UPSERT_MAX_ITEMS} items are allowed per request')
+        cleaned, errors = validate_item(item, partial)
+        sku = cleaned.get('sku') if cleaned else None
+        if not errors and sku in seen_skus:
+            errors = {'sku': 'Duplicate SKU in request.'}
+        result = {'index': index, 'sku': sku}
+        results.append(result)
+        if errors:
+            result.update(status='error', errors=errors)
+            continue
+        seen_skus.add(sku)
+        batch.append((result, cleaned))
+
+    batch_size = settings.BULK_UPSERT_BATCH_SIZE
+    for start in range(0, len(batch), batch_size):
+        chunk = batch[start:start + batch_size]
+        for _ in range(WRITE_ATTEMPTS):
+            try:
+                _write_batch(chunk, partial)
+                break
+            except IntegrityError:
+                # A concurrent writer created one of the SKUs; they now exist
+                continue
+        else:
+            for result, _ in chunk:
+                result.pop('id', None)
+                result.update(status='error', errors={
+                    'non_field_errors': 'Conflicting concurrent writes to this batch; retry the item.'
+                })
+
+    return results
+
+def _write_batch(batch, partial):
+    now = timezone.now()
+    with transaction.atomic():
+        restore_archived_products([cleaned['sku'] for _, cleaned in batch])
+        existing = ProductProduct.objects.select_for_update().in_bulk(
+            [cleaned['sku'] for _, cleaned in batch], field_name='sku'
+        )
+        to_create = []
+        to_update = []
+        update_fields = set()
+
+        for result, cleaned in batch:
+            product = existing.get(cleaned['sku'])
+            if product is None:
+                if partial:
+                    result.update(status='error', errors={'sku': 'Product not found.'})
+                    continue
+                product = ProductProduct(**cleaned)
+                to_create.append((result, product))
+                continue
+
+            changed = [
+                field for field in UPDATABLE_FIELDS
+                if field in cleaned and getattr(product, field) != cleaned[field]
+            ]
+            result['id'] = product.id
+            if not changed:
+                result['status'] = 'unchanged'
+                continue
+            for field in changed:
+                setattr(product, field, cleaned[field])
+            product.updated_at = now
+            update_fields.update(changed)
+            to_update.append((result, product))
+
+        if to_create:
+            ProductProduct.objects.bulk_create([product for _, product in to_create])
+        if to_update:
+            ProductProduct.objects.bulk_update(
+                [product for _, product in to_update], sorted(update_fields | {'updated_at'})
+            )
+
+        written = []
+        for result, product in to_create:
+            result.update(status='created', id=product.id)
+            written.append((ProductEvent.EVENT_CREATED, product))
+        for result, product in to_update:
+            result['status'] = 'updated'
+            written.append((ProductEvent.EVENT_UPDATED, product))
+
+        if written:
+            ProductChange.record(
+                (product.id, product.sku, ProductChange.OPERATION_UPSERT) for _, product in written
+            )
+            ProductEvent.enqueue((event_type, product.id, None) for event_type, product in written)
+            bump_catalog_generation()
+
+def summarize(results):
+    summary = {'created': 0, 'updated': 0, 'unchanged': 0, 'error': 0}
+    for result in results:
+        summary[result['status']] += 1
+    return summary
@@ -0,0 +1,172 @@
+import csv
+import io
+import zlib
+from asgiref.sync import sync_to_async
+from product.services.fast_serializer import render_json
+
+# Same columns CSVImporter reads, so an export can be imported back as-is
+EXPORT_FIELDS = ['sku', 'name', 'description', 'price', 'is_active', 'image_url']
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+DEFAULT_CHUNK_SIZE = 2000
+
+class ExportError(ValueError):
+    """Raised when an export cannot be produced with the requested options"""
+
+def iter_product_chunks(queryset, fields=EXPORT_FIELDS, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield lists of value tuples walking the table by primary key.
+
+    Keyset pagination keeps every query an index range scan, so memory and
+    per-chunk cost stay constant regardless of catalog size.
+    """
+    last_id = 0
+    while True:
+        rows = list(
+            queryset.filter(id__gt=last_id)
+            .order_by('id')
+            .values_list('id', *fields)[:chunk_size]
+        )
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        yield [row[1:] for row in rows]
+
+def _csv_value(field, value):
+    if value is None:
+        return ''
+    if field == 'is_active':
+        return 'true' if value else 'false'
+    return value
+
+def _csv_stream(chunks):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    yield buffer.getvalue().encode()
+    for chunk in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            [_csv_value(field, value) for field, value in zip(EXPORT_FIELDS, row)]
+            for row in chunk
+        )
+        yield buffer.getvalue().encode()
+
+def _ndjson_stream(chunks):
+    for chunk in chunks:
+        lines = []
+        for row in chunk:
+            record = dict(zip(EXPORT_FIELDS, row))
+            record['price'] = str(record['price'])
+            lines.append(render_json(record))
+        yield b'\n'.join(lines) + b'\n'
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object handing written bytes back to a generator"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+def _parquet_stream(chunks):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ('sku', pa.string()),
+        ('name', pa.string()),
+        ('description', pa.string()),
+        ('price', pa.decimal128(10, 2)),
+        ('is_active', pa.bool_()),
+        ('image_url', pa.string()),
+    ])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        # One row group per chunk keeps only a single chunk in memory
+        for chunk in chunks:
+            columns = list(zip(*chunk))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                schema=schema,
+            ))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+def _gzip_stream(stream):
+    compressor = zlib.compressobj(wbits=31)
+    for data in stream:
+        compressed = compressor.compress(data)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def export_filename(export_format, compress=False):
+    extension = EXPORT_FORMATS[export_format][1]
+    return f'products.{extension}.gz' if compress else f'products.{extension}'
+
+def export_content_type(export_format, compress=False):
+    return 'application/gzip' if compress else EXPORT_FORMATS[export_format][0]
+
+def stream_export(queryset, export_format='csv', compress=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Return an iterator of bytes for the products in queryset"""
+    if export_format not in EXPORT_FORMATS:
+        raise ExportError(f'Unsupported export format: {export_format}')
+    if export_format == 'parquet':
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ExportError('Parquet export requires pyarrow to be installed')
+
+    chunks = iter_product_chunks(queryset, chunk_size=chunk_size)
+    if export_format == 'csv':
+        stream = _csv_stream(chunks)
+    elif export_format == 'ndjson':
+        stream = _ndjson_stream(chunks)
+    else:
+        stream = _parquet_stream(chunks)
+
+    return _gzip_stream(stream) if compress else stream
+
+async def aiter_export(stream):
+    """
+    Iterate an export stream from the event loop, one piece at a time.
+
+    Under ASGI, StreamingHttpResponse consumes a sync iterator whole before
+    sending it, so the catalog would be held in memory. Each step here runs
+    on the request's sync thread, where the export's queries belong.
+    """
+    next_piece = sync_to_async(next, thread_sensitive=True)
+    try:
+        while True:
+            data = await next_piece(stream, None)
+            if data is None:
+                return
+            yield data
+    finally:
+        # Also runs when the client disconnects mid-download
+        await sync_to_async(stream.close, thread_sensitive=True)()
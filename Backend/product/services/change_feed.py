@@ -0,0 +1,126 @@
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Case, Max, Value, When
+from product.models import ProductChange, ProductEvent, ProductProduct
+from product.services.fast_serializer import get_row_serializer
+from product.services.response_cache import bump_catalog_generation
+
+DEFAULT_PAGE_SIZE = 1000
+MAX_PAGE_SIZE = 10000
+# pg_advisory_xact_lock key held while numbering changes
+SEQUENCER_LOCK_ID = 0x70726F64
+
+def delete_products(queryset, chunk_size=1000):
+    """
+    Delete products in primary-key chunks.
+
+    Each chunk writes its tombstones and product.deleted outbox events in
+    the same transaction as the delete.
+    """
+    deleted = 0
+    last_id = 0
+    while True:
+        products = list(queryset.filter(id__gt=last_id).order_by('id')[:chunk_size])
+        if not products:
+            break
+        last_id = products[-1].id
+        with transaction.atomic():
+            ProductChange.record(
+                (product.id, product.sku, ProductChange.OPERATION_DELETE) for product in products
+            )
+            ProductEvent.enqueue(
+                (ProductEvent.EVENT_DELETED, product.id, product.event_data()) for product in products
+            )
+            deleted += ProductProduct.objects.filter(id__in=[product.id for product in products]).delete()[0]
+            bump_catalog_generation()
+    return deleted
+
+class _SequenceConflict(Exception):
+    """Another sequencer numbered some of the changes first"""
+
+def _lock_sequencer():
+    # SQLite transactions are IMMEDIATE and already hold the write lock
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_xact_lock(%s)', [SEQUENCER_LOCK_ID])
+
+def sequence_changes(batch_size=5000):
+    """
+    Number committed changes that have no sequence yet, in id order.
+
+    Only committed rows are visible here, so a transaction that commits
+    after a later id has been numbered still gets a higher sequence and is
+    never skipped by a consumer's cursor. Runs from the
+    sequence_product_changes beat task; callers are serialized by a lock,
+    and a number once given is never changed. Returns the number of changes
+    sequenced.
+    """
+    pending_changes = ProductChange.objects.filter(sequence__isnull=True)
+    sequenced = 0
+    while True:
+        try:
+            with transaction.atomic():
+                _lock_sequencer()
+                pending = list(pending_changes.order_by('id').values_list('id', flat=True)[:batch_size])
+                if not pending:
+                    return sequenced
+                last = ProductChange.objects.aggregate(last=Max('sequence'))['last'] or 0
+                updated = pending_changes.filter(id__in=pending).update(sequence=Case(
+                    *(When(id=change_id, then=Value(last + offset)) for offset, change_id in enumerate(pending, 1))
+                ))
+                if updated != len(pending):
+                    raise _SequenceConflict()
+        except (IntegrityError, _SequenceConflict):
+            # Numbered by another caller meanwhile; start from its last sequence
+            continue
+        sequenced += len(pending)
+
+def get_changes(since=0, limit=DEFAULT_PAGE_SIZE):
+    """
+    Return product changes with a sequence greater than since.
+
+    Several changes to the same product within a page collapse into its
+    latest state. Changes appear once the sequencer has numbered them.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    changes = list(
+        ProductChange.objects.filter(sequence__gt=since)
+        .order_by('sequence')
+        .values_list('sequence', 'product_id', 'sku', 'operation')[:limit + 1]
+    )
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    
+    latest = {}
+    for sequence, product_id, sku, operation in changes:
+        latest.pop(product_id, None)
+        latest[product_id] = (sequence, sku, operation)
+    
+    row_serializer = get_row_serializer()
+    upserted_ids = [
+        product_id for product_id, (_, _, operation) in latest.items()
+        if operation == ProductChange.OPERATION_UPSERT
+    ]
+    products = {
+        row[0]: row_serializer.to_representation(row)
+        for row in row_serializer.values_list(ProductProduct.objects.filter(id__in=upserted_ids))
+    }
+    
+    data = []
+    for product_id, (sequence, sku, operation) in latest.items():
+        product = products.get(product_id)
+        if product is None:
+            # Deleted since the change was recorded; its tombstone follows
+            operation = ProductChange.OPERATION_DELETE
+        data.append({
+            'sequence': sequence,
+            'operation': operation,
+            'id': product_id,
+            'sku': sku,
+            'product': product,
+        })
+    
+    return {
+        'data': data,
+        'next_cursor': changes[-1][0] if changes else since,
+        'has_more': has_more,
+    }
@@ -0,0 +1,70 @@
+import json
+from rest_framework import serializers
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+# Field types whose to_representation is the identity for values coming
+# straight from the database driver
+PASSTHROUGH_FIELDS = (
+    serializers.IntegerField,
+    serializers.CharField,
+    serializers.BooleanField,
+    serializers.ReadOnlyField,
+)
+
+class ProductRowSerializer:
+    """
+    Read-only fast path producing exactly what ProductSerializer outputs.
+
+    Field objects are built once; rows come from values_list() so no model
+    instances are created. Fields whose representation is not the identity
+    (price, timestamps) reuse the matching DRF field's to_representation.
+    """
+
+    def __init__(self, serializer_class=None):
+        if serializer_class is None:
+            # Imported here: product.models depends on this package
+            from product.serializers import ProductSerializer
+            serializer_class = ProductSerializer
+        fields = serializer_class().fields
+        self.field_names = list(fields.keys())
+        self._converters = [
+            None if isinstance(field, PASSTHROUGH_FIELDS) else field.to_representation
+            for field in fields.values()
+        ]
+
+    def values_list(self, queryset):
+        """Return queryset as tuples in field_names order"""
+        return queryset.values_list(*self.field_names)
+
+    def to_representation(self, row):
+        return {
+            name: value if value is None or convert is None else convert(value)
+            for name, convert, value in zip(self.field_names, self._converters, row)
+        }
+
+    def serialize(self, rows):
+        return [self.to_representation(row) for row in rows]
+
+_default_row_serializer = None
+
+def get_row_serializer():
+    """Return the process-wide ProductRowSerializer"""
+    global _default_row_serializer
+    if _default_row_serializer is None:
+        _default_row_serializer = ProductRowSerializer()
+    return _default_row_serializer
+
+def render_json(data):
+    """Render data to the same bytes as DRF's JSONRenderer, using orjson when available"""
+    if orjson is None:
+        body = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode()
+    else:
+        body = orjson.dumps(data)
+    # JSONRenderer escapes these for JavaScript compatibility
+    if b'\xe2\x80\xa8' in body or b'\xe2\x80\xa9' in body:
+        body = body.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return body
@@ -0,0 +1,165 @@
+import asyncio
+import functools
+import queue
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+import httpx
+from django.conf import settings
+from django.utils import timezone
+from product.models import ProductProduct
+
+IMAGE_FIELDS = [
+    'image_status', 'image_content_type', 'image_size', 'image_etag',
+    'image_last_modified', 'image_checked_url', 'image_checked_at',
+]
+
+def verify_product_images(queryset=None, concurrency=None, per_host=None, timeout=None, chunk_size=1000):
+    """
+    Verify image_url for the products in queryset and record the results.
+
+    Runs HEAD requests over one pooled client, starting the next as soon as
+    any finishes, bounded both globally and per host, and sends the stored
+    ETag/Last-Modified so unchanged images are answered with 304. Results
+    are saved every chunk_size checks. Returns a count per outcome.
+
+    Only the requests run on an event loop, in a helper thread; products
+    are read and saved synchronously in the calling thread, so the ORM uses
+    the same connection the worker's task hooks manage.
+    """
+    if queryset is None:
+        queryset = ProductProduct.objects.all()
+    queryset = queryset.exclude(image_url__isnull=True).exclude(image_url='')
+    concurrency = concurrency or settings.IMAGE_VERIFY_CONCURRENCY
+    per_host = per_host or settings.IMAGE_VERIFY_PER_HOST
+
+    summary = defaultdict(int)
+    host_limits = defaultdict(lambda: asyncio.Semaphore(per_host))
+    slots = threading.Semaphore(concurrency)
+    finished = queue.SimpleQueue()
+    checked = []
+    running = 0
+
+    def on_done(product, future):
+        slots.release()
+        finished.put((product, future))
+
+    def collect(block):
+        nonlocal running
+        while running:
+            try:
+                product, future = finished.get(block=block)
+            except queue.Empty:
+                return
+            running -= 1
+            summary[future.result()] += 1
+            checked.append(product)
+            if len(checked) >= chunk_size:
+                _save(checked)
+
+    client = httpx.AsyncClient(
+        timeout=timeout or settings.IMAGE_VERIFY_TIMEOUT,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+    )
+    with _event_loop_thread() as loop:
+        try:
+            for product in _iter_products(queryset, chunk_size):
+                # Start a check whenever any slot frees up, so a slow URL never
+                # holds back the rest of a chunk
+                slots.acquire()
+                future = asyncio.run_coroutine_threadsafe(
+                    _verify(client, host_limits[_host(product.image_url)], product), loop
+                )
+                running += 1
+                future.add_done_callback(functools.partial(on_done, product))
+                collect(block=False)
+            collect(block=True)
+        finally:
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop).result()
+    _save(checked)
+    return dict(summary)
+
+@contextmanager
+def _event_loop_thread():
+    """Run an event loop in a helper thread for the duration of the block"""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, name='image-verifier', daemon=True)
+    thread.start()
+    try:
+        yield loop
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+def _iter_products(queryset, chunk_size):
+    last_id = 0
+    while True:
+        products = list(
+            queryset.filter(id__gt=last_id).order_by('id').only('id', 'image_url', *IMAGE_FIELDS)[:chunk_size]
+        )
+        if not products:
+            return
+        last_id = products[-1].id
+        yield from products
+
+def _save(checked):
+    if checked:
+        ProductProduct.objects.bulk_update(checked, IMAGE_FIELDS)
+        del checked[:]
+
+def _host(url):
+    try:
+        return urlsplit(url).netloc
+    except ValueError:
+        return ''
+
+async def _verify(client, host_limit, product):
+    headers = {}
+    if product.image_checked_url == product.image_url:
+        if product.image_etag:
+            headers['If-None-Match'] = product.image_etag
+        if product.image_last_modified:
+            headers['If-Modified-Since'] = product.image_last_modified
+
+    async with host_limit:
+        try:
+            response = await client.head(product.image_url, headers=headers)
+            if response.status_code in (405, 501):
+                # Some hosts refuse HEAD; stream a GET and only read its headers
+                async with client.stream('GET', product.image_url, headers=headers) as response:
+                    pass
+        except (httpx.InvalidURL, httpx.UnsupportedProtocol):
+            # Malformed URLs, which the CSV import does not reject
+            response = None
+            product.image_status = 'invalid'
+        except httpx.HTTPError:
+            response = None
+            product.image_status = 'unreachable'
+
+    product.image_checked_at = timezone.now()
+    if response is None:
+        return product.image_status
+    if response.status_code == 304:
+        product.image_status = 'ok' if (product.image_content_type or '').startswith('image/') else 'invalid'
+        return 'unchanged'
+
+    product.image_checked_url = product.image_url
+    product.image_content_type = response.headers.get('Content-Type', '').split(';')[0].strip() or None
+    content_length = response.headers.get('Content-Length')
+    product.image_size = int(content_length) if content_length and content_length.isdigit() else None
+
+    if response.status_code >= 400:
+        product.image_status = 'broken'
+    elif not (product.image_content_type or '').startswith('image/'):
+        product.image_status = 'invalid'
+    else:
+        product.image_status = 'ok'
+
+    # Only keep validators of a successful response for the next conditional request
+    successful = response.status_code < 400
+    product.image_etag = response.headers.get('ETag') if successful else None
+    product.image_last_modified = response.headers.get('Last-Modified') if successful else None
+    return product.image_status
@@ -0,0 +1,111 @@
+import hashlib
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from rest_framework.response import Response
+from core.db_routing import is_pinned_to_primary, replicas_caught_up
+from product.services.fast_serializer import render_json
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = 'catalog:generation'
+
+_batched = ContextVar('catalog_batch', default=False)
+
+def get_catalog_generation():
+    """Return the current catalog generation, seeding it when missing"""
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        # Seed from the clock so an evicted counter never reuses an old generation
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+def _increment_generation():
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+    except Exception as e:
+        logger.warning('Failed to bump catalog generation: %s', e)
+
+def bump_catalog_generation():
+    """Invalidate cached product responses once the current transaction commits"""
+    if _batched.get():
+        return
+    transaction.on_commit(_increment_generation)
+
+@contextmanager
+def catalog_batch():
+    """
+    Collapse the generation bumps of every write in the block into one.
+
+    Wrap a transaction that saves many products so the generation moves
+    once when it commits rather than once per row.
+    """
+    if _batched.get():
+        yield
+        return
+    token = _batched.set(True)
+    try:
+        yield
+    finally:
+        _batched.reset(token)
+    bump_catalog_generation()
+
+def _cache_key(request, scope, generation):
+    query = sorted(request.query_params.lists())
+    raw = f'{request.get_host()}|{request.path}|{query}'
+    digest = hashlib.sha1(raw.encode()).hexdigest()
+    return f'products:{generation}:{scope}:{digest}'
+
+def _etag_matches(request, etag):
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    candidates = [value.strip() for value in header.split(',')]
+    return '*' in candidates or etag in candidates or f'W/{etag}' in candidates
+
+def cached_json_response(request, scope, build_data):
+    """
+    Serve a product read from the response cache.
+
+    build_data is only called on a miss; the rendered JSON bytes are stored
+    under a key that includes the catalog generation, so any product write
+    makes previous entries unreachable. Clients pinned to the primary after
+    a write bypass the cache, whose entries may come from a replica that
+    had not seen the write yet, and misses read from a lagging replica are
+    not stored.
+    """
+    if request.accepted_renderer.format != 'json':
+        return Response(build_data())
+
+    key, entry = None, None
+    if not is_pinned_to_primary():
+        try:
+            key = _cache_key(request, scope, get_catalog_generation())
+            entry = cache.get(key)
+        except Exception as e:
+            logger.warning('Product response cache unavailable: %s', e)
+
+    if entry is None:
+        body = render_json(build_data())
+        entry = (body, f'"{hashlib.sha1(body).hexdigest()}"')
+        if key is not None and replicas_caught_up():
+            try:
+                cache.set(key, entry, settings.PRODUCT_CACHE_TIMEOUT)
+            except Exception as e:
+                logger.warning('Failed to cache product response: %s', e)
+
+    body, etag = entry
+    if _etag_matches(request, etag):
+        response = HttpResponse(status=304)
+    else:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    return response
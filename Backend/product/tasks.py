@@ -0,0 +1,24 @@
+from celery import shared_task
+from django.utils.dateparse import parse_datetime
+from .models import ProductProduct
+from .services.archive import archive_inactive_products
+from .services.change_feed import sequence_changes
+from .services.image_verifier import verify_product_images
+
+@shared_task
+def verify_images_async(updated_since=None):
+    """Verify image URLs of products updated since the given ISO timestamp (all when omitted)"""
+    queryset = ProductProduct.objects.all()
+    if updated_since:
+        queryset = queryset.filter(updated_at__gte=parse_datetime(updated_since))
+    return verify_product_images(queryset)
+
+@shared_task
+def sequence_product_changes():
+    """Number newly committed changes for the change feed"""
+    return sequence_changes()
+
+@shared_task
+def archive_products_async():
+    """Move long-inactive products to the archive table"""
+    return archive_inactive_products()
\ No newline at end of file
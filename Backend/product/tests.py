@@ -0,0 +1,308 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.db.models import Max
+from django.test import TestCase, TransactionTestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from core.db_routing import _lag_cache
+from product.models import ProductArchive, ProductChange, ProductProduct
+from product.serializers import ProductSerializer
+from product.services import bulk_upsert, fast_serializer, image_verifier
+from product.services.archive import archive_inactive_products
+from product.services.change_feed import get_changes, sequence_changes
+from product.services.image_verifier import verify_product_images
+from product.services.response_cache import catalog_batch, get_catalog_generation
+
+class ReplicaCacheTests(TestCase):
+    """Product reads against the replica_0 stand-in, which is not replicated"""
+    databases = {'default', 'replica_0'}
+
+    def setUp(self):
+        cache.clear()
+        _lag_cache.clear()
+        self.client = APIClient()
+
+    def _set_lag(self, seconds):
+        _lag_cache['replica_0'] = (time.monotonic(), seconds)
+
+    def _replicate(self, *skus):
+        ProductProduct.objects.using('replica_0').bulk_create([
+            ProductProduct(id=product.id, sku=product.sku, name=product.name, price=product.price)
+            for product in ProductProduct.objects.filter(sku__in=skus)
+        ])
+
+    def _count(self, client=None):
+        return (client or self.client).get('/api/products/').json()['count']
+
+    def test_list_reads_from_replica(self):
+        ProductProduct.objects.create(sku='A1', name='Primary only', price=1)
+        self.assertEqual(self._count(), 0)
+
+        self._replicate('A1')
+        cache.clear()
+        self.assertEqual(self._count(), 1)
+
+    def test_lagging_replica_is_skipped(self):
+        ProductProduct.objects.create(sku='A1', name='Primary only', price=1)
+        self._set_lag(60)
+        self.assertEqual(self._count(), 1)
+
+    def test_writer_reads_own_write_past_cached_entry(self):
+        # An entry filled from the replica before the write
+        self.assertEqual(self._count(), 0)
+
+        response = self.client.post('/api/products/', {'sku': 'A1', 'name': 'New', 'price': '5.00'})
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('db_primary_until', response.cookies)
+
+        self.assertEqual(self._count(), 1)
+        self.assertEqual(self.client.get(f'/api/products/{response.json()["id"]}/').status_code, 200)
+
+    def test_pinned_reads_do_not_fill_cache(self):
+        self.client.post('/api/products/', {'sku': 'A1', 'name': 'New', 'price': '5.00'})
+        self.assertEqual(self._count(), 1)
+
+        self.assertEqual(self._count(APIClient()), 0)
+
+    def test_lagging_replica_reads_are_not_cached(self):
+        self._set_lag(2)
+        self.assertEqual(self._count(), 0)
+
+        ProductProduct.objects.create(sku='A1', name='Caught up', price=1)
+        self._replicate('A1')
+        self._set_lag(0)
+        self.assertEqual(self._count(), 1)
+
+    def test_caught_up_replica_reads_are_cached(self):
+        self.assertEqual(self._count(), 0)
+
+        ProductProduct.objects.create(sku='A1', name='Not bumped yet', price=1)
+        self._replicate('A1')
+        # The generation only moves on commit, which this test never reaches
+        self.assertEqual(self._count(), 0)
+
+class ResponseCacheTests(TestCase):
+    databases = {'default', 'replica_0'}
+
+    def setUp(self):
+        cache.clear()
+        _lag_cache.clear()
+
+    def _save(self, product):
+        # The generation moves on commit, which TestCase only simulates
+        with self.captureOnCommitCallbacks(execute=True):
+            product.save()
+        ProductProduct.objects.using('replica_0').filter(id=product.id).delete()
+        ProductProduct.objects.using('replica_0').bulk_create([product])
+
+    def test_unchanged_list_is_revalidated_with_304(self):
+        self._save(ProductProduct(sku='E1', name='Cached', price=1))
+        response = APIClient().get('/api/products/')
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        response = APIClient().get('/api/products/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    def test_write_bumps_generation_and_etag(self):
+        product = ProductProduct(sku='E1', name='Before', price=1)
+        self._save(product)
+        generation = get_catalog_generation()
+        etag = APIClient().get(f'/api/products/{product.id}/')['ETag']
+
+        product.name = 'After'
+        self._save(product)
+        self.assertEqual(get_catalog_generation(), generation + 1)
+
+        response = APIClient().get(f'/api/products/{product.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['name'], 'After')
+
+    def test_batch_bumps_generation_once(self):
+        generation = get_catalog_generation()
+        with self.captureOnCommitCallbacks(execute=True), catalog_batch():
+            for sku in ('E1', 'E2', 'E3'):
+                ProductProduct.objects.create(sku=sku, name=sku, price=1)
+        self.assertEqual(get_catalog_generation(), generation + 1)
+
+class FastSerializerTests(TestCase):
+    def setUp(self):
+        ProductProduct.objects.create(sku='F1', name='Plain', description=None, price='0.10')
+        ProductProduct.objects.create(
+            sku='F2', name='Caf\u00e9 \u2603 "quoted" \\ \u2028', description='Line\nbreak\u2029\t\x01',
+            price='99999999.99', is_active=False,
+        )
+
+    def _assert_same_bytes(self):
+        queryset = ProductProduct.objects.order_by('id')
+        expected = JSONRenderer().render(ProductSerializer(queryset, many=True).data)
+        row_serializer = fast_serializer.ProductRowSerializer()
+        rows = row_serializer.values_list(queryset)
+        self.assertEqual(fast_serializer.render_json(row_serializer.serialize(rows)), expected)
+
+    def test_output_matches_drf_byte_for_byte(self):
+        self._assert_same_bytes()
+
+    def test_output_matches_drf_without_orjson(self):
+        with mock.patch.object(fast_serializer, 'orjson', None):
+            self._assert_same_bytes()
+
+class BulkUpsertTests(TestCase):
+    def test_values_are_trimmed_like_the_api(self):
+        bulk_upsert.bulk_write([{'sku': 'b1', 'name': 'Same', 'price': 1}])
+        results = bulk_upsert.bulk_write([{'sku': ' b1 ', 'name': ' Same ', 'price': '1.00'}])
+        self.assertEqual(results[0]['status'], 'unchanged')
+
+    def test_repeated_conflicts_are_reported_per_item(self):
+        with mock.patch.object(bulk_upsert, '_write_batch', side_effect=IntegrityError) as write_batch:
+            results = bulk_upsert.bulk_write([{'sku': 'b2', 'name': 'New', 'price': 1}])
+        self.assertEqual(write_batch.call_count, bulk_upsert.WRITE_ATTEMPTS)
+        self.assertEqual(results[0]['status'], 'error')
+
+class ChangeFeedTests(TestCase):
+    def _read_all(self, since=0, limit=2):
+        sequences = []
+        while True:
+            page = get_changes(since, limit)
+            sequences += [change['sequence'] for change in page['data']]
+            since = page['next_cursor']
+            if not page['has_more']:
+                return sequences, since
+
+    def test_feed_pages_sequenced_changes_without_writing(self):
+        for sku in ('C1', 'C2', 'C3'):
+            ProductProduct.objects.create(sku=sku, name=sku, price=1)
+
+        self.assertEqual(get_changes()['data'], [])
+        self.assertFalse(ProductChange.objects.filter(sequence__isnull=False).exists())
+
+        self.assertEqual(sequence_changes(), 3)
+        sequences, cursor = self._read_all()
+        self.assertEqual(sequences, [1, 2, 3])
+        self.assertEqual(cursor, 3)
+
+    def test_late_commit_lands_after_the_cursor(self):
+        for sku in ('C1', 'C2', 'C3'):
+            ProductProduct.objects.create(sku=sku, name=sku, price=1)
+        # The first change's transaction has not committed yet
+        late = ProductChange.objects.get(sku='C1')
+        late_id = late.id
+        late.delete()
+        sequence_changes()
+        sequences, cursor = self._read_all()
+        self.assertEqual(sequences, [1, 2])
+
+        ProductChange.objects.create(id=late_id, product_id=late.product_id, sku=late.sku, operation=late.operation)
+        sequence_changes()
+
+        self.assertEqual(self._read_all(cursor)[0], [3])
+        self.assertEqual(ProductChange.objects.get(id=late_id).sequence, 3)
+
+    def test_numbered_changes_are_never_renumbered(self):
+        for sku in ('C1', 'C2'):
+            ProductProduct.objects.create(sku=sku, name=sku, price=1)
+        sequence_changes()
+        numbered = dict(ProductChange.objects.values_list('id', 'sequence'))
+        ProductProduct.objects.create(sku='C3', name='C3', price=1)
+
+        # A sequencer that read the last sequence before another one committed
+        stale_then_current = [{'last': 0}, ProductChange.objects.aggregate(last=Max('sequence'))]
+        with mock.patch.object(ProductChange.objects, 'aggregate', side_effect=stale_then_current):
+            self.assertEqual(sequence_changes(), 1)
+
+        sequences = dict(ProductChange.objects.values_list('id', 'sequence'))
+        self.assertEqual({change_id: sequences[change_id] for change_id in numbered}, numbered)
+        self.assertEqual(sorted(sequences.values()), [1, 2, 3])
+
+class ArchiveTests(TestCase):
+    def test_rearchiving_a_recreated_sku_replaces_the_stale_copy(self):
+        ProductProduct.objects.create(sku='R1', name='Old', price=1, is_active=False)
+        self.assertEqual(archive_inactive_products(inactive_days=-1), 1)
+        ProductProduct.objects.create(sku='R1', name='New', price=2, is_active=False)
+
+        self.assertEqual(archive_inactive_products(inactive_days=-1), 1)
+        self.assertEqual(list(ProductArchive.objects.values_list('sku', 'name')), [('R1', 'New')])
+
+class _ImageHostHandler(BaseHTTPRequestHandler):
+    # path -> (status, content type); HEAD is refused for nohead.png
+    ROUTES = {
+        '/ok.jpg': (200, 'image/jpeg'),
+        '/nohead.png': (200, 'image/png'),
+        '/page.html': (200, 'text/html'),
+    }
+
+    def do_HEAD(self):
+        if self.path == '/nohead.png':
+            self._respond(405, 'text/plain')
+        elif self.path == '/ok.jpg' and self.headers.get('If-None-Match') == '"v1"':
+            self._respond(304, None)
+        else:
+            self._respond(*self.ROUTES.get(self.path, (404, 'text/plain')))
+
+    def do_GET(self):
+        self._respond(*self.ROUTES.get(self.path, (404, 'text/plain')))
+
+    def _respond(self, status, content_type):
+        self.send_response(status)
+        if content_type:
+            self.send_header('Content-Type', content_type)
+            self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', '0' if status == 304 else '128')
+        self.end_headers()
+        if self.command == 'GET' and status != 304:
+            self.wfile.write(b'x' * 128)
+
+    def log_message(self, *args):
+        pass
+
+class ImageVerifierTests(TransactionTestCase):
+    """Checks against a local stub image host"""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _ImageHostHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        base = f'http://127.0.0.1:{self.server.server_port}'
+        for sku, path in [('OK', '/ok.jpg'), ('NOHEAD', '/nohead.png'), ('PAGE', '/page.html'), ('GONE', '/gone.jpg')]:
+            ProductProduct.objects.create(sku=sku, name=sku, price=1, image_url=base + path)
+        ProductProduct.objects.create(sku='DOWN', name='Down', price=1, image_url='http://127.0.0.1:9/down.jpg')
+        ProductProduct.objects.create(sku='BADURL', name='Bad URL', price=1, image_url='http://host:port/x.jpg')
+
+    def _statuses(self):
+        return dict(ProductProduct.objects.values_list('sku', 'image_status'))
+
+    def test_records_outcome_per_product(self):
+        saved_in = set()
+        save = image_verifier._save
+
+        def record_thread(checked):
+            saved_in.add(threading.get_ident())
+            save(checked)
+
+        with mock.patch.object(image_verifier, '_save', record_thread):
+            summary = verify_product_images(concurrency=2, per_host=1, timeout=2, chunk_size=2)
+
+        self.assertEqual(summary, {'ok': 2, 'invalid': 2, 'broken': 1, 'unreachable': 1})
+        self.assertEqual(self._statuses(), {
+            'OK': 'ok', 'NOHEAD': 'ok', 'PAGE': 'invalid', 'GONE': 'broken', 'DOWN': 'unreachable',
+            'BADURL': 'invalid',
+        })
+        # Results are written by the calling thread, not the event loop's
+        self.assertEqual(saved_in, {threading.get_ident()})
+        product = ProductProduct.objects.get(sku='OK')
+        self.assertEqual((product.image_content_type, product.image_size, product.image_etag), ('image/jpeg', 128, '"v1"'))
+
+    def test_unchanged_images_are_checked_conditionally(self):
+        verify_product_images(timeout=2)
+        summary = verify_product_images(queryset=ProductProduct.objects.filter(sku='OK'), timeout=2)
+
+        self.assertEqual(summary, {'unchanged': 1})
+        self.assertEqual(self._statuses()['OK'], 'ok')
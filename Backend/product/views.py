@@ -1,10 +1,25 @@
 from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from django.core.handlers.asgi import ASGIRequest
 from django.db.models import Q
+from django.http import StreamingHttpResponse
+from core.db_routing import replica_reads
 from .models import ProductProduct
 from .serializers import ProductSerializer
+from .services.bulk_upsert import BulkRequestError, bulk_write, iter_json_items, summarize
+from .services.catalog_export import (
+    ExportError, aiter_export, export_content_type, export_filename, stream_export
+)
+from .services.change_feed import DEFAULT_PAGE_SIZE, delete_products, get_changes
+from .services.fast_serializer import get_row_serializer
+from .services.response_cache import cached_json_response
+
+class ProductPagination(PageNumberPagination):
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
 
 class ProductViewSet(viewsets.ModelViewSet):
     """
@@ -19,6 +34,7 @@ class ProductViewSet(viewsets.ModelViewSet):
     """
     queryset = ProductProduct.objects.all()
     serializer_class = ProductSerializer
+    pagination_class = ProductPagination
     
     def get_queryset(self):
         queryset = ProductProduct.objects.all()
@@ -44,36 +60,99 @@ class ProductViewSet(viewsets.ModelViewSet):
         
         return queryset
     
+    @replica_reads
     def list(self, request):
         """GET /api/products/ with enhanced search"""
-        queryset = self.get_queryset()
+        return cached_json_response(request, 'list', lambda: self._list_data(request))
+    
+    @replica_reads
+    def retrieve(self, request, pk=None):
+        """GET /api/products/{id}/"""
+        return cached_json_response(
+            request, f'detail:{pk}', lambda: self.get_serializer(self.get_object()).data
+        )
+    
+    def _list_data(self, request):
+        row_serializer = get_row_serializer()
+        queryset = row_serializer.values_list(self.get_queryset())
         page = self.paginate_queryset(queryset)
         
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            paginated_response = self.get_paginated_response(serializer.data)
+            data = row_serializer.serialize(page)
+            count = self.paginator.page.paginator.count
             
             # Wrap in data format
             response_data = {
-                'data': serializer.data,
-                'page': int(request.query_params.get('page', 1)),
-                'page_size': int(request.query_params.get('page_size', 50)),
-                'total': queryset.count(),
-                'count': queryset.count(),
-                'next': paginated_response.data.get('next'),
-                'previous': paginated_response.data.get('previous'),
-                'results': serializer.data
+                'data': data,
+                'page': self.paginator.page.number,
+                'page_size': self.paginator.get_page_size(request),
+                'total': count,
+                'count': count,
+                'next': self.paginator.get_next_link(),
+                'previous': self.paginator.get_previous_link(),
+                'results': data
             }
-            return Response(response_data)
+            return response_data
+        
+        return {'data': row_serializer.serialize(queryset)}
+    
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """GET /api/products/export/?type=csv|ndjson|parquet&compress=gzip"""
+        export_format = request.query_params.get('type', 'csv')
+        compress = request.query_params.get('compress') == 'gzip'
+        
+        try:
+            stream = stream_export(self.get_queryset(), export_format, compress)
+        except ExportError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if isinstance(request._request, ASGIRequest):
+            stream = aiter_export(stream)
+        
+        response = StreamingHttpResponse(
+            stream, content_type=export_content_type(export_format, compress)
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{export_filename(export_format, compress)}"'
+        )
+        return response
+    
+    @action(detail=False, methods=['get'], url_path='changes')
+    def changes(self, request):
+        """GET /api/products/changes/?since={cursor}&limit={n}"""
+        try:
+            since = int(request.query_params.get('since', 0))
+            limit = int(request.query_params.get('limit', DEFAULT_PAGE_SIZE))
+        except ValueError:
+            return Response({'error': 'since and limit must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response(get_changes(since, limit))
+    
+    @action(detail=False, methods=['post'], url_path='bulk-upsert')
+    def bulk_upsert(self, request):
+        """POST /api/products/bulk-upsert/ with a JSON array or NDJSON of products keyed by SKU"""
+        return self._bulk_write(request, partial=False)
+    
+    @action(detail=False, methods=['patch'], url_path='bulk-update')
+    def bulk_update(self, request):
+        """PATCH /api/products/bulk-update/ with a JSON array or NDJSON of partial products keyed by SKU"""
+        return self._bulk_write(request, partial=True)
+    
+    def _bulk_write(self, request, partial):
+        # Read the raw stream instead of request.data so large bodies are
+        # parsed incrementally rather than loaded whole
+        try:
+            items = iter_json_items(request.stream, request.content_type)
+            results = bulk_write(items, partial=partial)
+        except BulkRequestError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
-        serializer = self.get_serializer(queryset, many=True)
-        return Response({'data': serializer.data})
+        return Response({'summary': summarize(results), 'results': results})
     
     @action(detail=False, methods=['delete'], url_path='bulk-delete')
     def bulk_delete(self, request):
         """DELETE /api/products/bulk-delete/"""
-        count = ProductProduct.objects.all().count()
-        ProductProduct.objects.all().delete()
+        count = delete_products(ProductProduct.objects.all())
         return Response({
             'deleted_count': count,
             'message': f'Successfully deleted {count} products'
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webhook', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='webhookconfig',
+            name='coalesce_window',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webhook', '0002_webhookconfig_coalesce_window'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='webhookconfig',
+            name='rate_limit',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
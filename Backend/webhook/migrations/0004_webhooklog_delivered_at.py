@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:23
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webhook', '0003_webhookconfig_rate_limit'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='webhooklog',
+            name='delivered_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunSQL(
+            'UPDATE webhook_log SET delivered_at = created_at',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
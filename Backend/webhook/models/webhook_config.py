@@ -6,6 +6,10 @@ class WebhookConfig(BaseModel):
     url = models.URLField()
     event_types = models.JSONField(default=list)  # ['product.created', 'product.updated', 'product.deleted']
     is_enabled = models.BooleanField(default=True)
+    # Seconds to collapse events for the same product into one delivery; 0 sends immediately
+    coalesce_window = models.PositiveIntegerField(default=0)
+    # Deliveries per second allowed across all workers; 0 means unlimited
+    rate_limit = models.PositiveIntegerField(default=0)
     
     class Meta:
         db_table = 'webhook_config'
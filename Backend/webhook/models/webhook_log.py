@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from core.models import BaseModel
 from .webhook_config import WebhookConfig
 
@@ -12,6 +13,8 @@ class WebhookLog(BaseModel):
     response_time = models.FloatField(null=True)  # in seconds
     success = models.BooleanField(default=False)
     error_message = models.TextField(null=True, blank=True)
+    # When the delivery finished; created_at is when the buffered log was written
+    delivered_at = models.DateTimeField(default=timezone.now)
     
     class Meta:
         db_table = 'webhook_log'
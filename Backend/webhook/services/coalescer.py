@@ -0,0 +1,207 @@
+import json
+import time
+import uuid
+from core.redis_client import get_redis
+
+PENDING_KEY = 'webhook:{webhook_id}:pending'
+SCHEDULED_KEY = 'webhook:{webhook_id}:flush-scheduled'
+INFLIGHT_KEY = 'webhook:{webhook_id}:inflight:{token}'
+# Webhooks that may have pending events, and in-flight keys scored by take time
+WEBHOOKS_KEY = 'webhook:coalesce:webhooks'
+INFLIGHT_INDEX_KEY = 'webhook:coalesce:inflight'
+
+# Merge an event into the pending hash (field = product id) and report
+# whether a flush needs scheduling. A created product stays "created" through
+# later updates, and one deleted before it was ever delivered is dropped.
+# The schedule marker expires after the window, so if its flush task is lost
+# the sweeper can schedule another.
+MERGE_SCRIPT = """
+redis.call('SADD', KEYS[3], ARGV[5])
+local previous = redis.call('HGET', KEYS[1], ARGV[1])
+if previous then
+    local previous_type = cjson.decode(previous)['event_type']
+    if previous_type == 'product.created' and ARGV[2] == 'product.updated' then
+        return 0
+    end
+    if previous_type == 'product.created' and ARGV[2] == 'product.deleted' then
+        redis.call('HDEL', KEYS[1], ARGV[1])
+        return 0
+    end
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[3])
+if redis.call('SET', KEYS[2], '1', 'NX', 'EX', ARGV[4]) then
+    return 1
+end
+return 0
+"""
+
+# Move the pending hash to an in-flight key and clear the schedule marker
+# atomically, so events arriving during a flush start a new window. The
+# in-flight key is kept until the flush acks it.
+TAKE_SCRIPT = """
+redis.call('DEL', KEYS[3])
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('RENAME', KEYS[1], KEYS[2])
+    redis.call('ZADD', KEYS[4], ARGV[1], KEYS[2])
+    return redis.call('HGETALL', KEYS[2])
+end
+return {}
+"""
+
+ACK_SCRIPT = """
+redis.call('DEL', KEYS[1])
+redis.call('ZREM', KEYS[2], KEYS[1])
+return 1
+"""
+
+# Put in-flight events back in front of the ones pending since, with the
+# same merge rules, and report whether a flush needs scheduling
+RESTORE_SCRIPT = """
+local entries = redis.call('HGETALL', KEYS[1])
+for i = 1, #entries, 2 do
+    local product_id, entry = entries[i], entries[i + 1]
+    local pending = redis.call('HGET', KEYS[2], product_id)
+    if not pending then
+        redis.call('HSET', KEYS[2], product_id, entry)
+    elseif cjson.decode(entry)['event_type'] == 'product.created' then
+        local pending_type = cjson.decode(pending)['event_type']
+        if pending_type == 'product.updated' then
+            redis.call('HSET', KEYS[2], product_id, entry)
+        elseif pending_type == 'product.deleted' then
+            redis.call('HDEL', KEYS[2], product_id)
+        end
+    end
+end
+redis.call('DEL', KEYS[1])
+redis.call('ZREM', KEYS[4], KEYS[1])
+redis.call('SADD', KEYS[5], ARGV[2])
+if redis.call('EXISTS', KEYS[2]) == 1 and redis.call('SET', KEYS[3], '1', 'NX', 'EX', ARGV[1]) then
+    return 1
+end
+return 0
+"""
+
+# Forget a webhook without pending events, or claim the schedule marker of
+# one whose flush was lost
+SWEEP_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    redis.call('SREM', KEYS[3], ARGV[2])
+    return 0
+end
+if redis.call('SET', KEYS[2], '1', 'NX', 'EX', ARGV[1]) then
+    return 1
+end
+return 0
+"""
+
+def _marker_ttl(window):
+    return window * 2 + 60
+
+def coalesce_event(webhook, event_type, product_id, data=None):
+    """Add an event to the webhook's pending set, scheduling a flush for a new window"""
+    from webhook.tasks import flush_coalesced_webhook
+
+    window = webhook.coalesce_window
+    entry = json.dumps({'event_type': event_type, 'data': data})
+    scheduled = get_redis().eval(
+        MERGE_SCRIPT,
+        3,
+        PENDING_KEY.format(webhook_id=webhook.id),
+        SCHEDULED_KEY.format(webhook_id=webhook.id),
+        WEBHOOKS_KEY,
+        product_id,
+        event_type,
+        entry,
+        _marker_ttl(window),
+        webhook.id,
+    )
+    if scheduled:
+        flush_coalesced_webhook.apply_async(args=[webhook.id], countdown=window)
+
+def take_pending_events(webhook_id):
+    """
+    Move the pending events in flight and return (token, events).
+
+    events are (event_type, product_id, data) tuples. The caller must pass
+    token to ack_pending_events once they are delivered, or to
+    restore_pending_events if delivery fails.
+    """
+    token = INFLIGHT_KEY.format(webhook_id=webhook_id, token=uuid.uuid4().hex)
+    entries = get_redis().eval(
+        TAKE_SCRIPT,
+        4,
+        PENDING_KEY.format(webhook_id=webhook_id),
+        token,
+        SCHEDULED_KEY.format(webhook_id=webhook_id),
+        INFLIGHT_INDEX_KEY,
+        time.time(),
+    )
+    events = []
+    for product_id, entry in zip(entries[::2], entries[1::2]):
+        entry = json.loads(entry)
+        events.append((entry['event_type'], int(product_id), entry['data']))
+    return token, events
+
+def ack_pending_events(token):
+    """Drop in-flight events once delivered"""
+    get_redis().eval(ACK_SCRIPT, 2, token, INFLIGHT_INDEX_KEY)
+
+def restore_pending_events(webhook, token):
+    """Merge undelivered in-flight events back into the pending set and reschedule the flush"""
+    from webhook.tasks import flush_coalesced_webhook
+
+    scheduled = get_redis().eval(
+        RESTORE_SCRIPT,
+        5,
+        token,
+        PENDING_KEY.format(webhook_id=webhook.id),
+        SCHEDULED_KEY.format(webhook_id=webhook.id),
+        INFLIGHT_INDEX_KEY,
+        WEBHOOKS_KEY,
+        _marker_ttl(webhook.coalesce_window),
+        webhook.id,
+    )
+    if scheduled:
+        flush_coalesced_webhook.apply_async(args=[webhook.id], countdown=webhook.coalesce_window)
+    return bool(scheduled)
+
+def sweep_pending_events(webhooks, inflight_timeout):
+    """
+    Recover events stranded by lost flush tasks or crashed workers.
+
+    webhooks maps webhook id to its WebhookConfig. In-flight events older
+    than inflight_timeout seconds go back to the pending set, and a flush is
+    scheduled for every webhook with pending events but no flush marker.
+    Returns the number of flushes scheduled.
+    """
+    from webhook.tasks import flush_coalesced_webhook
+
+    redis = get_redis()
+    scheduled = 0
+    for token in redis.zrangebyscore(INFLIGHT_INDEX_KEY, '-inf', time.time() - inflight_timeout):
+        token = token.decode()
+        webhook = webhooks.get(int(token.split(':')[1]))
+        if webhook is None:
+            ack_pending_events(token)
+            continue
+        scheduled += restore_pending_events(webhook, token)
+
+    for webhook_id in redis.smembers(WEBHOOKS_KEY):
+        webhook = webhooks.get(int(webhook_id))
+        if webhook is None:
+            redis.delete(PENDING_KEY.format(webhook_id=int(webhook_id)))
+            redis.srem(WEBHOOKS_KEY, webhook_id)
+            continue
+        needs_flush = redis.eval(
+            SWEEP_SCRIPT,
+            3,
+            PENDING_KEY.format(webhook_id=webhook.id),
+            SCHEDULED_KEY.format(webhook_id=webhook.id),
+            WEBHOOKS_KEY,
+            _marker_ttl(webhook.coalesce_window),
+            webhook.id,
+        )
+        if needs_flush:
+            flush_coalesced_webhook.apply_async(args=[webhook.id])
+            scheduled += 1
+    return scheduled
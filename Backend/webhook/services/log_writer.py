@@ -0,0 +1,49 @@
+import time
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from analytics.services.rollups import record_webhook_logs
+from core.write_lock import database_write_lock
+from webhook.models import WebhookLog
+
+class WebhookLogWriter:
+    """
+    Buffer webhook logs and write them with one bulk insert per flush.
+
+    Funnelling a delivery batch's logs into a single short write transaction
+    keeps log writes from contending with the importer for the database
+    write lock, which matters most on SQLite, where both queue behind
+    database_write_lock. The analytics rollups are updated in the same
+    transaction. Logs are flushed every batch_size entries or once the
+    oldest has waited max_delay seconds, bounding what a crash can lose.
+    """
+
+    def __init__(self, batch_size=None, max_delay=None):
+        self.batch_size = batch_size or settings.WEBHOOK_LOG_BATCH_SIZE
+        self.max_delay = settings.WEBHOOK_LOG_FLUSH_SECONDS if max_delay is None else max_delay
+        self._pending = []
+        self._first_added = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
+    def add(self, **fields):
+        # The delivery time, not the flush time, is the log's time
+        fields.setdefault('delivered_at', timezone.now())
+        self._pending.append(WebhookLog(**fields))
+        if self._first_added is None:
+            self._first_added = time.monotonic()
+        if (len(self._pending) >= self.batch_size
+                or time.monotonic() - self._first_added >= self.max_delay):
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        pending, self._pending, self._first_added = self._pending, [], None
+        with database_write_lock(), transaction.atomic():
+            WebhookLog.objects.bulk_create(pending)
+            record_webhook_logs(pending)
@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.db import transaction
+from product.models import ProductEvent
+from webhook.tasks import deliver_product_events
+
+def relay_outbox(batch_size=500):
+    """
+    Move one batch of outbox events into the webhook pipeline.
+
+    Rows are locked with SKIP LOCKED so several relays can drain the outbox
+    concurrently, and are only deleted once the delivery tasks are published
+    in the same transaction, giving at-least-once delivery. Each task
+    carries at most OUTBOX_DELIVERY_BATCH_SIZE events, so a worker lost
+    mid-task redelivers a small batch.
+    """
+    with transaction.atomic():
+        events = list(
+            ProductEvent.objects.select_for_update(skip_locked=True)
+            .order_by('id')
+            .values_list('id', 'event_type', 'product_id', 'data')[:batch_size]
+        )
+        if not events:
+            return 0
+        
+        step = settings.OUTBOX_DELIVERY_BATCH_SIZE
+        for start in range(0, len(events), step):
+            deliver_product_events.delay(
+                [[event_type, product_id, data] for _, event_type, product_id, data in events[start:start + step]]
+            )
+        ProductEvent.objects.filter(id__in=[event[0] for event in events]).delete()
+    return len(events)
+
+def drain_outbox(batch_size=500, max_batches=None):
+    """Relay batches until the outbox is empty or max_batches is reached"""
+    relayed = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        count = relay_outbox(batch_size)
+        if not count:
+            break
+        relayed += count
+        batches += 1
+    return relayed
@@ -0,0 +1,82 @@
+from email.utils import parsedate_to_datetime
+from django.conf import settings
+from django.utils import timezone
+from core.redis_client import get_redis
+
+BUCKET_KEY = 'webhook:{webhook_id}:bucket'
+BLOCKED_KEY = 'webhook:{webhook_id}:blocked'
+
+# Token bucket holding up to one second of deliveries, refilled at ARGV[1]
+# tokens per second using the Redis clock so all workers agree. A sender that
+# finds the bucket empty still takes a token, driving it negative, and is told
+# how long to wait for its reserved slot; this spreads deferred deliveries
+# out instead of waking them all at once. While the endpoint is blocked after
+# a 429 nothing is reserved and the remaining block time is returned.
+# Returns {wait_ms, reserved}.
+ACQUIRE_SCRIPT = """
+local blocked = redis.call('PTTL', KEYS[2])
+if blocked > 0 then
+    return {blocked, 0}
+end
+local rate = tonumber(ARGV[1])
+if rate <= 0 or ARGV[2] == '0' then
+    return {0, 0}
+end
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or rate
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(rate, tokens + (now - updated) * rate / 1000) - 1
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil((rate - tokens) * 1000 / rate) + 1000)
+if tokens >= 0 then
+    return {0, 0}
+end
+return {math.ceil(-tokens * 1000 / rate), 1}
+"""
+
+# Block the endpoint for ARGV[1] ms unless it is already blocked for longer
+BLOCK_SCRIPT = """
+if redis.call('PTTL', KEYS[1]) < tonumber(ARGV[1]) then
+    redis.call('SET', KEYS[1], '1', 'PX', ARGV[1])
+end
+return 0
+"""
+
+def acquire_slot(webhook, consume=True):
+    """
+    Take a delivery slot for the webhook from its shared token bucket.
+
+    Returns (wait, reserved): the seconds to wait before sending, and
+    whether a slot was reserved so the sender should not take another one.
+    """
+    wait_ms, reserved = get_redis().eval(
+        ACQUIRE_SCRIPT,
+        2,
+        BUCKET_KEY.format(webhook_id=webhook.id),
+        BLOCKED_KEY.format(webhook_id=webhook.id),
+        webhook.rate_limit,
+        int(consume),
+    )
+    return wait_ms / 1000, bool(reserved)
+
+def block_endpoint(webhook, seconds):
+    """Hold back all deliveries to the webhook for the given number of seconds"""
+    get_redis().eval(BLOCK_SCRIPT, 1, BLOCKED_KEY.format(webhook_id=webhook.id), int(seconds * 1000))
+
+def parse_retry_after(value):
+    """Return the delay in seconds requested by a Retry-After header, bounded by settings"""
+    seconds = None
+    if value:
+        value = value.strip()
+        if value.isdigit():
+            seconds = int(value)
+        else:
+            try:
+                seconds = (parsedate_to_datetime(value) - timezone.now()).total_seconds()
+            except (TypeError, ValueError):
+                seconds = None
+    if seconds is None:
+        seconds = settings.WEBHOOK_RETRY_AFTER_DEFAULT
+    return min(max(seconds, 1), settings.WEBHOOK_RETRY_AFTER_MAX)
@@ -1,45 +1,185 @@
+import logging
 import time
-import requests
+from django.conf import settings
 from django.utils import timezone
+from core.async_http import get_async_client
+from core.http import get_session
 from product.models import ProductProduct
-from webhook.models import WebhookConfig, WebhookLog
+from webhook.models import WebhookConfig
+from webhook.services.coalescer import (
+    ack_pending_events, coalesce_event, restore_pending_events, sweep_pending_events, take_pending_events
+)
+from webhook.services.log_writer import WebhookLogWriter
+from webhook.services.rate_limiter import acquire_slot, block_endpoint, parse_retry_after
 
-def execute_webhook(event_type, product_id):
+logger = logging.getLogger(__name__)
+
+# Redis-backed features currently failing in this process, so each outage is
+# logged once rather than for every event
+_unavailable = set()
+
+def execute_webhook(event_type, product_id, data=None):
     """Execute webhooks for a specific event"""
-    try:
-        product = ProductProduct.objects.get(id=product_id)
-        
+    execute_webhooks([(event_type, product_id, data)])
+
+def execute_webhooks(events):
+    """
+    Execute webhooks for a batch of (event_type, product_id, data) events.
+
+    Existing products are re-read so deliveries carry their latest state;
+    data is used when the product is gone, as for product.deleted events.
+    """
+    webhooks = list(WebhookConfig.objects.filter(is_enabled=True))
+    if not webhooks:
+        return
+    
+    deliveries = []
+    for event_type, product_id, data in events:
         # Get all enabled webhooks that listen to this event
-        webhooks = WebhookConfig.objects.filter(
-            is_enabled=True,
-            event_types__contains=[event_type]
-        )
-        
-        payload = {
-            'event_type': event_type,
-            'timestamp': timezone.now().isoformat(),
-            'data': {
-                'id': product.id,
-                'sku': product.sku,
-                'name': product.name,
-                'description': product.description,
-                'price': float(product.price),
-                'is_active': product.is_active,
-            }
-        }
-        
-        for webhook in webhooks:
-            _send_webhook(webhook, event_type, payload)
-            
-    except ProductProduct.DoesNotExist:
-        pass
-
-def _send_webhook(webhook, event_type, payload):
-    """Send individual webhook"""
+        subscribers = [webhook for webhook in webhooks if event_type in webhook.event_types]
+        immediate = [
+            webhook for webhook in subscribers
+            if not (webhook.coalesce_window and _coalesce(webhook, event_type, product_id, data))
+        ]
+        if immediate:
+            deliveries.append((immediate, event_type, product_id, data))
+    
+    if not deliveries:
+        return
+    
+    products = ProductProduct.objects.in_bulk({delivery[2] for delivery in deliveries})
+    with WebhookLogWriter() as log_writer:
+        for immediate, event_type, product_id, data in deliveries:
+            _deliver(immediate, event_type, products.get(product_id), data, log_writer)
+
+def flush_coalesced_events(webhook_id):
+    """Deliver the latest state of every product pending for a coalescing webhook"""
+    token, events = take_pending_events(webhook_id)
+    webhook = WebhookConfig.objects.filter(id=webhook_id, is_enabled=True).first()
+    if webhook is None or not events:
+        ack_pending_events(token)
+        return 0
+    
+    try:
+        products = ProductProduct.objects.in_bulk({product_id for _, product_id, _ in events})
+        with WebhookLogWriter() as log_writer:
+            for event_type, product_id, data in events:
+                _deliver([webhook], event_type, products.get(product_id), data, log_writer)
+    except Exception:
+        restore_pending_events(webhook, token)
+        raise
+    ack_pending_events(token)
+    return len(events)
+
+def sweep_coalesced_events():
+    """Reschedule flushes for pending or in-flight events a lost task left behind"""
+    webhooks = WebhookConfig.objects.filter(is_enabled=True).in_bulk()
+    return sweep_pending_events(webhooks, settings.WEBHOOK_COALESCE_INFLIGHT_TIMEOUT)
+
+def _coalesce(webhook, event_type, product_id, data):
+    """Queue the event in the webhook's window; False means send it right away"""
+    try:
+        coalesce_event(webhook, event_type, product_id, data)
+    except Exception as e:
+        _report_unavailable('coalescing', e)
+        return False
+    _report_available('coalescing')
+    return True
+
+def _report_unavailable(feature, error):
+    """Log a Redis-backed feature failing, once until it works again"""
+    if feature not in _unavailable:
+        _unavailable.add(feature)
+        logger.error('Webhook %s unavailable, delivering without it: %s', feature, error, exc_info=error)
+
+def _report_available(feature):
+    if feature in _unavailable:
+        _unavailable.discard(feature)
+        logger.info('Webhook %s available again', feature)
+
+def _deliver(webhooks, event_type, product, data, log_writer):
+    if product is not None:
+        data = product.event_data()
+    elif data is None:
+        return
+    
+    payload = {
+        'event_type': event_type,
+        'timestamp': timezone.now().isoformat(),
+        'data': data,
+    }
+    
+    for webhook in webhooks:
+        _dispatch(webhook, event_type, payload, log_writer)
+
+def deliver_deferred(webhook_id, event_type, payload, reserved=False, retries=0, not_before=None):
+    """Send a delivery that was deferred by the webhook's rate limit"""
+    webhook = WebhookConfig.objects.filter(id=webhook_id, is_enabled=True).first()
+    if webhook is None:
+        return
+    
+    remaining = (not_before or 0) - time.time()
+    if remaining > 1:
+        # Still inside a wait longer than one deferral step
+        _defer(webhook, event_type, payload, remaining, reserved, retries)
+        return
+    
+    with WebhookLogWriter() as log_writer:
+        _dispatch(webhook, event_type, payload, log_writer, reserved, retries)
+
+def _dispatch(webhook, event_type, payload, log_writer, reserved=False, retries=0):
+    """Send now if the endpoint's rate limit allows it, otherwise defer to a task"""
+    try:
+        wait, reserved = acquire_slot(webhook, consume=not reserved)
+    except Exception as e:
+        _report_unavailable('rate limiting', e)
+        wait = 0
+    else:
+        _report_available('rate limiting')
+    if wait:
+        _defer(webhook, event_type, payload, wait, reserved, retries)
+        return
+    
+    response = _send_webhook(webhook, event_type, payload, log_writer)
+    if response is None or not _is_throttled(response):
+        return
+    
+    # The receiver asked us to slow down: pause every worker, then retry
+    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+    try:
+        block_endpoint(webhook, retry_after)
+    except Exception as e:
+        _report_unavailable('rate limiting', e)
+    if retries < settings.WEBHOOK_RATE_LIMIT_MAX_RETRIES:
+        _defer(webhook, event_type, payload, retry_after, False, retries + 1)
+
+def _is_throttled(response):
+    return response.status_code == 429 or (
+        response.status_code == 503 and 'Retry-After' in response.headers
+    )
+
+def _defer(webhook, event_type, payload, countdown, reserved, retries):
+    """
+    Re-queue a delivery to run after countdown seconds.
+
+    Long waits are split into steps of at most WEBHOOK_MAX_DEFER_SECONDS, so
+    workers never hold far-future ETA tasks, which the broker would also
+    redeliver once they outlive its visibility timeout.
+    """
+    from webhook.tasks import deliver_webhook
+    
+    deliver_webhook.apply_async(
+        args=[webhook.id, event_type, payload],
+        kwargs={'reserved': reserved, 'retries': retries, 'not_before': time.time() + countdown},
+        countdown=min(countdown, settings.WEBHOOK_MAX_DEFER_SECONDS),
+    )
+
+def _send_webhook(webhook, event_type, payload, log_writer):
+    """Send individual webhook, returning the response or None when it could not be sent"""
     start_time = time.time()
     
     try:
-        response = requests.post(
+        response = get_session().post(
             webhook.url,
             json=payload,
             timeout=30,
@@ -49,7 +189,7 @@ def _send_webhook(webhook, event_type, payload):
         response_time = time.time() - start_time
         success = 200 <= response.status_code < 300
         
-        WebhookLog.objects.create(
+        log_writer.add(
             webhook=webhook,
             event_type=event_type,
             payload=payload,
@@ -58,11 +198,12 @@ def _send_webhook(webhook, event_type, payload):
             response_time=response_time,
             success=success
         )
+        return response
         
     except Exception as e:
         response_time = time.time() - start_time
         
-        WebhookLog.objects.create(
+        log_writer.add(
             webhook=webhook,
             event_type=event_type,
             payload=payload,
@@ -70,23 +211,25 @@ def _send_webhook(webhook, event_type, payload):
             success=False,
             error_message=str(e)
         )
+        return None
 
-def test_webhook_sync(webhook):
-    """Test webhook synchronously"""
-    test_payload = {
+def _test_payload():
+    return {
         'event_type': 'test',
         'timestamp': timezone.now().isoformat(),
         'data': {
             'message': 'This is a test webhook'
         }
     }
-    
+
+async def test_webhook_async(webhook):
+    """Test webhook without blocking a worker thread, using the shared async client"""
     start_time = time.time()
     
     try:
-        response = requests.post(
+        response = await get_async_client().post(
             webhook.url,
-            json=test_payload,
+            json=_test_payload(),
             timeout=10,
             headers={'Content-Type': 'application/json'}
         )
@@ -110,4 +253,4 @@ def test_webhook_sync(webhook):
             'response_time': response_time,
             'error_message': str(e),
             'message': 'Test webhook failed'
-        }
\ No newline at end of file
+        }
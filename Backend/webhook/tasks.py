@@ -1,7 +1,37 @@
 from celery import shared_task
-from .services.webhook_executor import execute_webhook
+from .services.webhook_executor import (
+    deliver_deferred, execute_webhook, execute_webhooks, flush_coalesced_events, sweep_coalesced_events
+)
 
 @shared_task
-def trigger_webhook_async(event_type, product_id):
+def trigger_webhook_async(event_type, product_id, data=None):
     """Trigger webhooks asynchronously"""
-    execute_webhook(event_type, product_id)
\ No newline at end of file
+    execute_webhook(event_type, product_id, data)
+
+# The outbox rows are already deleted, so the message is only acked once
+# delivery finishes and is requeued if the worker dies mid-batch
+@shared_task(acks_late=True, reject_on_worker_lost=True)
+def deliver_product_events(events):
+    """Deliver a batch of relayed outbox events"""
+    execute_webhooks(events)
+
+@shared_task
+def flush_coalesced_webhook(webhook_id):
+    """Deliver the events collected during a webhook's coalescing window"""
+    return flush_coalesced_events(webhook_id)
+
+@shared_task
+def sweep_coalesced_webhooks():
+    """Recover coalesced events whose flush task was lost"""
+    return sweep_coalesced_events()
+
+@shared_task
+def deliver_webhook(webhook_id, event_type, payload, reserved=False, retries=0, not_before=None):
+    """Send one delivery held back by its webhook's rate limit"""
+    deliver_deferred(webhook_id, event_type, payload, reserved, retries, not_before)
+
+@shared_task
+def relay_product_events():
+    """Drain the product event outbox into the webhook pipeline"""
+    from .services.outbox_relay import drain_outbox
+    return drain_outbox(max_batches=100)
\ No newline at end of file
@@ -0,0 +1,106 @@
+from unittest import mock
+import fakeredis
+import redis
+from django.test import TestCase, override_settings
+from core import redis_client
+from product.models import ProductEvent, ProductProduct
+from webhook.models import WebhookConfig, WebhookLog
+from webhook.services import outbox_relay, webhook_executor
+from webhook.services.rate_limiter import acquire_slot, block_endpoint
+
+class RateLimiterTests(TestCase):
+    """Token bucket and 429 blocking against an in-memory Redis"""
+
+    def setUp(self):
+        self.server = fakeredis.FakeServer()
+        patcher = mock.patch.object(redis_client, '_client', fakeredis.FakeRedis(server=self.server))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        webhook_executor._unavailable.clear()
+        self.webhook = WebhookConfig.objects.create(url='http://hooks.test/', rate_limit=5)
+
+    def _dispatch(self, status=200, headers=None):
+        response = mock.Mock(status_code=status, headers=headers or {}, text='')
+        with mock.patch.object(webhook_executor, 'get_session') as get_session, \
+                mock.patch('webhook.tasks.deliver_webhook.apply_async') as apply_async, \
+                webhook_executor.WebhookLogWriter() as log_writer:
+            get_session.return_value.post.return_value = response
+            webhook_executor._dispatch(self.webhook, 'product.updated', {'data': {}}, log_writer)
+        return get_session.return_value.post, apply_async
+
+    def test_bursts_wait_for_their_slot_at_the_configured_rate(self):
+        for _ in range(5):
+            self.assertEqual(acquire_slot(self.webhook), (0, False))
+
+        # Each sender past the burst reserves the next slot, 1/rate apart
+        for expected in (0.2, 0.4, 0.6):
+            wait, reserved = acquire_slot(self.webhook)
+            self.assertAlmostEqual(wait, expected, delta=0.05)
+            self.assertTrue(reserved)
+
+        # A sender holding a reservation does not take another token
+        self.assertEqual(acquire_slot(self.webhook, consume=False), (0, False))
+
+    def test_unlimited_webhooks_never_wait(self):
+        self.webhook.rate_limit = 0
+        for _ in range(20):
+            self.assertEqual(acquire_slot(self.webhook), (0, False))
+
+    def test_block_is_only_extended(self):
+        block_endpoint(self.webhook, 30)
+        block_endpoint(self.webhook, 5)
+
+        wait, reserved = acquire_slot(self.webhook)
+        self.assertAlmostEqual(wait, 30, delta=1)
+        self.assertFalse(reserved)
+
+    def test_retry_after_blocks_the_endpoint_and_defers(self):
+        post, apply_async = self._dispatch(status=429, headers={'Retry-After': '12'})
+
+        post.assert_called_once()
+        self.assertEqual(apply_async.call_args.kwargs['countdown'], 12)
+        self.assertEqual(apply_async.call_args.kwargs['kwargs']['retries'], 1)
+        self.assertAlmostEqual(acquire_slot(self.webhook)[0], 12, delta=1)
+
+        # Deliveries during the block are deferred without being sent
+        post, apply_async = self._dispatch()
+        post.assert_not_called()
+        self.assertAlmostEqual(apply_async.call_args.kwargs['countdown'], 12, delta=1)
+        self.assertEqual(WebhookLog.objects.count(), 1)
+
+    def test_redis_outage_is_logged_once(self):
+        self.server.connected = False
+        with self.assertLogs(webhook_executor.logger, 'ERROR') as logs:
+            self._dispatch()
+            post, _ = self._dispatch()
+        post.assert_called_once()
+        self.assertEqual(len(logs.records), 1)
+        self.assertIsInstance(logs.records[0].exc_info[1], redis.ConnectionError)
+
+@override_settings(OUTBOX_DELIVERY_BATCH_SIZE=2)
+class OutboxRelayTests(TestCase):
+    def setUp(self):
+        for sku in ('O1', 'O2', 'O3'):
+            ProductProduct.objects.create(sku=sku, name=sku, price=1)
+
+    def test_events_are_deleted_after_their_tasks_are_published(self):
+        published = []
+
+        def publish(events):
+            # Every relayed row is still in the outbox while tasks go out
+            self.assertEqual(ProductEvent.objects.count(), 3)
+            published.append(events)
+
+        with mock.patch.object(outbox_relay.deliver_product_events, 'delay', side_effect=publish):
+            self.assertEqual(outbox_relay.relay_outbox(), 3)
+
+        self.assertEqual([len(events) for events in published], [2, 1])
+        self.assertEqual({event[0] for events in published for event in events}, {'product.created'})
+        self.assertFalse(ProductEvent.objects.exists())
+
+    def test_failed_publish_keeps_the_events(self):
+        with mock.patch.object(outbox_relay.deliver_product_events, 'delay', side_effect=[None, ConnectionError]):
+            with self.assertRaises(ConnectionError):
+                outbox_relay.relay_outbox()
+
+        self.assertEqual(ProductEvent.objects.count(), 3)
@@ -1,10 +1,11 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import WebhookViewSet
+from .views import WebhookViewSet, webhook_test
 
 router = DefaultRouter()
 router.register('webhooks', WebhookViewSet)
 
 urlpatterns = [
+    path('webhooks/<int:pk>/test/', webhook_test, name='webhook_test'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -1,9 +1,11 @@
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from rest_framework import viewsets, status
-from rest_framework.decorators import action
 from rest_framework.response import Response
 from .models import WebhookConfig
 from .serializers import WebhookSerializer
-from .services.webhook_executor import test_webhook_sync
+from .services.webhook_executor import test_webhook_async
 
 class WebhookViewSet(viewsets.ModelViewSet):
     """
@@ -52,10 +54,18 @@ class WebhookViewSet(viewsets.ModelViewSet):
                 'details': [{'field': field, 'message': error[0]} for field, error in serializer.errors.items()]
             }
         }, status=status.HTTP_400_BAD_REQUEST)
+
+@csrf_exempt
+@require_POST
+async def webhook_test(request, pk):
+    """
+    POST /api/webhooks/{id}/test/
+    Send a test payload without holding a worker thread while waiting
+    """
+    try:
+        webhook = await WebhookConfig.objects.aget(pk=pk)
+    except WebhookConfig.DoesNotExist:
+        return JsonResponse({'error': 'Webhook not found'}, status=404)
     
-    @action(detail=True, methods=['post'])
-    def test(self, request, pk=None):
-        """POST /api/webhooks/{id}/test/"""
-        webhook = self.get_object()
-        result = test_webhook_sync(webhook)
-        return Response({'message': 'Test webhook sent successfully'})
\ No newline at end of file
+    result = await test_webhook_async(webhook)
+    return JsonResponse(result)
\ No newline at end of file